@@ -1,6 +1,13 @@
 from hypergeo.hypergeometric_distribution import *
 from hypergeo.binomial_distribution import *
 from hypergeo.generalization_bounds import *
+from hypergeo.curve_store import *
+from hypergeo.sweep import *
+from hypergeo.grid import *
+from hypergeo.streaming import *
+from hypergeo.inverse_table import *
+from hypergeo.monitor import *
 from hypergeo import utils
+from hypergeo import aio
 
 from version import __version__
@@ -0,0 +1,168 @@
+"""
+Asyncio counterparts of the bound functions.
+
+The computations are CPU-bound, so they are offloaded to an executor (the default thread pool of the event loop unless another one is set with 'set_executor'). Concurrent identical calls share a single in-flight computation. The optimization of mprime is split into chunks evaluated one after the other, so that cancelling the call stops the search between two chunks.
+
+Note that a process executor requires all arguments to be picklable, which excludes growth functions defined with lambdas (such as 'hypergeo.utils.sauer_shelah').
+"""
+import asyncio
+import functools
+import numpy as np
+
+from hypergeo import hypergeometric_distribution as hd
+from hypergeo import generalization_bounds as gb
+
+
+_executor = None
+_in_flight = {}
+
+
+def set_executor(executor):
+    """
+    Sets the executor on which the computations are run. If None, the default executor of the event loop is used.
+    """
+    global _executor
+    _executor = executor
+
+
+async def run(func, *args, **kwargs):
+    """
+    Runs a synchronous function on the executor.
+    """
+    return await asyncio.get_running_loop().run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+
+async def _shared(key, make_coroutine):
+    """
+    Awaits the computation identified by 'key', starting it with 'make_coroutine' if no identical computation is in flight. The computation is cancelled only once all its callers have been cancelled.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        key = (loop, key)
+        hash(key)
+    except TypeError: # Unhashable arguments cannot be deduplicated
+        return await make_coroutine()
+
+    entry = _in_flight.get(key)
+    if entry is None:
+        entry = _in_flight[key] = {'task': loop.create_task(make_coroutine()), 'waiters': 0}
+        entry['task'].add_done_callback(lambda _: _in_flight.pop(key) if _in_flight.get(key) is entry else None)
+
+    entry['waiters'] += 1
+    try:
+        return await asyncio.shield(entry['task'])
+    finally:
+        entry['waiters'] -= 1
+        if entry['waiters'] == 0 and not entry['task'].done():
+            entry['task'].cancel()
+
+
+async def optimize_mprime(k,
+                          m,
+                          growth_function,
+                          delta,
+                          max_mprime=10_000,
+                          min_mprime=1,
+                          bound=gb.hypinv_upperbound,
+                          optimization_mode='min',
+                          early_stopping=np.inf,
+                          return_bound=False,
+                          log_delta=False,
+                          search='linear',
+                          ratio_range=(1, 32),
+                          ratio_step=2**.25,
+                          return_n_evaluations=False,
+                          chunk_size=256):
+    """
+    Asynchronous version of 'hypergeo.optimize_mprime', with the same signature and returning the same result.
+
+    With the 'linear' search, the values of mprime are evaluated by chunks of 'chunk_size' on the executor and cancellation is checked between chunks. The 'ratio' search requires only O(log(m)) evaluations of the bound and is run as a single computation.
+    """
+    sign = 1 if optimization_mode == 'min' else -1
+    if search == 'linear':
+        best_mprime, best_bound, steps_since_last_best = None, None, 0
+        n_evaluations = 0
+        for start in range(min_mprime, max_mprime+1, chunk_size):
+            if steps_since_last_best >= early_stopping:
+                break
+            end = min(start + chunk_size - 1, max_mprime)
+            best_mprime, best_bound, chunk_n_evaluations, steps_since_last_best = await run(
+                gb._linear_mprime_search, k, m, growth_function, delta, start, end, bound, sign, early_stopping, log_delta,
+                best_mprime=best_mprime, best_bound=best_bound, steps_since_last_best=steps_since_last_best
+            )
+            n_evaluations += chunk_n_evaluations
+        if best_mprime is None: # Empty range of mprime
+            best_mprime, best_bound = min_mprime, 1 if sign == 1 else 0
+    elif search == 'ratio':
+        best_mprime, best_bound, n_evaluations = await run(gb._ratio_mprime_search, k, m, growth_function, delta, bound, sign, ratio_range, ratio_step, log_delta)
+    else:
+        raise ValueError(f"Unknown search '{search}'. Possible values are 'linear' and 'ratio'.")
+
+    result = (best_mprime,)
+    if return_bound:
+        result += (best_bound,)
+    if return_n_evaluations:
+        result += (n_evaluations,)
+    return result[0] if len(result) == 1 else result
+
+
+async def _bound_with_mprime(bound, k, m, growth_function, delta, mprime, max_mprime, log_delta, **optimize_kwargs):
+    if mprime is None:
+        if max_mprime is None:
+            max_mprime = 15*m
+        mprime = await optimize_mprime(k, m, growth_function, delta, max_mprime=max_mprime, bound=bound, log_delta=log_delta, **optimize_kwargs)
+    return await run(bound, k, m, growth_function, delta, mprime, log_delta=log_delta)
+
+
+async def hypinv_upperbound(k, m, growth_function, delta=0.05, mprime=None, max_mprime=None, log_delta=False):
+    """
+    Asynchronous version of 'hypergeo.hypinv_upperbound'.
+    """
+    if k == m:
+        return 1
+    key = ('hypinv_upperbound', k, m, growth_function, delta, mprime, max_mprime, log_delta)
+    return await _shared(key, lambda: _bound_with_mprime(gb.hypinv_upperbound, k, m, growth_function, delta, mprime, max_mprime, log_delta))
+
+
+async def hypinv_lowerbound(k, m, growth_function, delta=0.05, mprime=None, max_mprime=None, log_delta=False):
+    """
+    Asynchronous version of 'hypergeo.hypinv_lowerbound'.
+    """
+    if k == 0:
+        return 0
+    key = ('hypinv_lowerbound', k, m, growth_function, delta, mprime, max_mprime, log_delta)
+    return await _shared(key, lambda: _bound_with_mprime(gb.hypinv_lowerbound, k, m, growth_function, delta, mprime, max_mprime, log_delta, optimization_mode='max'))
+
+
+async def hypinv_reldev_upperbound(k, m, growth_function, delta=0.05, mprime=None, max_mprime=None, log_delta=False):
+    """
+    Asynchronous version of 'hypergeo.hypinv_reldev_upperbound'.
+    """
+    if k == m:
+        return 1
+    key = ('hypinv_reldev_upperbound', k, m, growth_function, delta, mprime, max_mprime, log_delta)
+    return await _shared(key, lambda: _bound_with_mprime(gb.hypinv_reldev_upperbound, k, m, growth_function, delta, mprime, max_mprime, log_delta))
+
+
+async def sample_compression_bound(k, m, d, delta, compression_scheme_prob=None):
+    """
+    Asynchronous version of 'hypergeo.sample_compression_bound'.
+    """
+    key = ('sample_compression_bound', k, m, d, delta, compression_scheme_prob)
+    return await _shared(key, lambda: run(gb.sample_compression_bound, k, m, d, delta, compression_scheme_prob))
+
+
+async def hypergeometric_tail_inverse(k, m, delta, M, log_delta=False):
+    """
+    Asynchronous version of 'hypergeo.hypergeometric_tail_inverse'.
+    """
+    key = ('hypergeometric_tail_inverse', k, m, delta, M, log_delta)
+    return await _shared(key, lambda: run(hd.hypergeometric_tail_inverse, k, m, delta, M, log_delta))
+
+
+async def hypergeometric_tail_lower_inverse(k, m, one_minus_delta, M, log_delta=False):
+    """
+    Asynchronous version of 'hypergeo.hypergeometric_tail_lower_inverse'.
+    """
+    key = ('hypergeometric_tail_lower_inverse', k, m, one_minus_delta, M, log_delta)
+    return await _shared(key, lambda: run(hd.hypergeometric_tail_lower_inverse, k, m, one_minus_delta, M, log_delta))
@@ -0,0 +1,254 @@
+"""
+Timing and agreement matrix of the implementations of the hypergeometric tail inverse.
+
+Every implementation registered in 'IMPLEMENTATIONS' is run on a randomized grid of points (k, m, delta, M) covering several regimes, and its result is compared to the one of 'hypergeometric_tail_inverse' with the python backend. Run it with
+
+    python -m hypergeo.benchmark --n_points=100 --output=benchmark.csv
+
+The report has one row per point and implementation, with the time taken and whether the result agrees with the reference. A compact summary is printed: the median time of each implementation in each regime, followed by the disagreements and errors. The summary is meant to choose the thresholds at which an implementation should be preferred to another, and to catch regressions: with '--baseline=<previous report>', the cells that became slower by more than a factor '--slowdown' are listed as well.
+
+The regimes are defined by the order of magnitude of the sample size m, of the ratio (M - m)/m and of delta.
+"""
+import csv
+import time
+from collections import defaultdict
+import numpy as np
+
+from hypergeo import jit
+from hypergeo.hypergeometric_distribution import hypergeometric_tail_inverse, asymptotic_hypergeometric_tail_inverse, batch_hypergeometric_tail_inverse, hypergeometric_tail_inverse_profile, berkopec_hypergeometric_tail_inverse, logberkopec_hypergeometric_tail_inverse, blocked_logberkopec_hypergeometric_tail_inverse, BerkopecSolver, naive_hypergeometric_tail_inverse
+from hypergeo.utils import func_to_cmd
+
+
+REFERENCE = 'bisection'
+
+# Each implementation takes (k, m, delta, M) with delta in linear scale and is only run if M is at most the given value, since the algorithms linear in M would take hours on the largest points. The time of the profile is the one of the whole sweep over k.
+IMPLEMENTATIONS = {
+    'bisection': (lambda k, m, delta, M: hypergeometric_tail_inverse(k, m, delta, M, backend='python'), None),
+    'bisection_log': (lambda k, m, delta, M: hypergeometric_tail_inverse(k, m, np.log(delta), M, log_delta=True, backend='python'), None),
+    'asymptotic': (lambda k, m, delta, M: asymptotic_hypergeometric_tail_inverse(k, m, delta, M, backend='python'), None),
+    'batch': (lambda k, m, delta, M: int(batch_hypergeometric_tail_inverse([k], [m], [delta], [M], backend='python')[0]), None),
+    'profile': (lambda k, m, delta, M: int(hypergeometric_tail_inverse_profile(m, delta, M, backend='python')[k]), 2*10**4),
+    'berkopec_above': (lambda k, m, delta, M: berkopec_hypergeometric_tail_inverse(k, m, delta, M, start='above'), 10**4),
+    'berkopec_below': (lambda k, m, delta, M: berkopec_hypergeometric_tail_inverse(k, m, delta, M, start='below'), 10**4),
+    'logberkopec_above': (lambda k, m, delta, M: logberkopec_hypergeometric_tail_inverse(k, m, np.log(delta), M, start='above', backend='python'), 10**5),
+    'logberkopec_below': (lambda k, m, delta, M: logberkopec_hypergeometric_tail_inverse(k, m, np.log(delta), M, start='below', backend='python'), 10**5),
+    'blocked_logberkopec': (lambda k, m, delta, M: blocked_logberkopec_hypergeometric_tail_inverse(k, m, np.log(delta), M), 10**7),
+    'berkopec_solver': (lambda k, m, delta, M: BerkopecSolver(m, M).tail_inverse(k, delta), 10**4),
+    'logberkopec_solver': (lambda k, m, delta, M: BerkopecSolver(m, M, log=True).tail_inverse(k, np.log(delta)), 10**5),
+    'naive_above': (lambda k, m, delta, M: naive_hypergeometric_tail_inverse(k, m, delta, M, start='above'), 2000),
+    'naive_below': (lambda k, m, delta, M: naive_hypergeometric_tail_inverse(k, m, delta, M, start='below'), 2000),
+}
+
+if jit.NUMBA_AVAILABLE:
+    IMPLEMENTATIONS.update({
+        'bisection_numba': (lambda k, m, delta, M: hypergeometric_tail_inverse(k, m, delta, M, backend='numba'), None),
+        'asymptotic_numba': (lambda k, m, delta, M: asymptotic_hypergeometric_tail_inverse(k, m, delta, M, backend='numba'), None),
+        'batch_numba': (lambda k, m, delta, M: int(batch_hypergeometric_tail_inverse([k], [m], [delta], [M], backend='numba')[0]), None),
+        'profile_numba': (lambda k, m, delta, M: int(hypergeometric_tail_inverse_profile(m, delta, M, backend='numba')[k]), 2*10**4),
+        'logberkopec_above_numba': (lambda k, m, delta, M: logberkopec_hypergeometric_tail_inverse(k, m, np.log(delta), M, start='above', backend='numba'), 10**7),
+        'logberkopec_below_numba': (lambda k, m, delta, M: logberkopec_hypergeometric_tail_inverse(k, m, np.log(delta), M, start='below', backend='numba'), 10**7),
+    })
+
+FIELDS = ('point', 'regime', 'k', 'm', 'M', 'delta', 'implementation', 'K', 'reference', 'status', 'time', 'error')
+
+
+def random_points(n_points, seed=0, m_range=(10, 10_000), ratio_range=(.1, 100), delta_range=(1e-60, .5)):
+    """
+    Draws a randomized grid of points (k, m, delta, M).
+
+    Args:
+        n_points (int): Number of points.
+        seed (int): Seed of the random generator.
+        m_range (tuple of int): Range of the sample size m, sampled log-uniformly.
+        ratio_range (tuple of float): Range of the ratio (M - m)/m, sampled log-uniformly.
+        delta_range (tuple of float): Range of delta, sampled log-uniformly.
+
+    Returns a list of tuples (k, m, delta, M).
+    """
+    rng = np.random.default_rng(seed)
+    log_uniform = lambda low, high: np.exp(rng.uniform(np.log(low), np.log(high)))
+    points = []
+    for _ in range(n_points):
+        m = int(round(log_uniform(*m_range)))
+        M = m + max(1, int(round(m*log_uniform(*ratio_range))))
+        # Most risks of interest are small, so k/m is drawn in [0, 1/2] with more weight near 0.
+        k = int(m*rng.uniform(0, 1)**2/2)
+        delta = float(log_uniform(*delta_range))
+        points.append((k, m, delta, M))
+    return points
+
+
+def regime(k, m, delta, M):
+    """
+    Returns the label of the regime of a point, made of the orders of magnitude of m, of (M - m)/m and of delta.
+    """
+    return f'm~1e{int(np.floor(np.log10(m)))} ratio~1e{int(np.floor(np.log10((M - m)/m)))} delta~1e{10*int(np.floor(np.log10(delta)/10))}'
+
+
+def run_benchmark(points, implementations=None, n_repeats=3):
+    """
+    Runs the implementations on every point and compares their results to the reference implementation.
+
+    Args:
+        points (list of tuples): Points (k, m, delta, M), as returned by 'random_points'.
+        implementations (list of str or None): Names of the implementations of 'IMPLEMENTATIONS' to run. If None, all are run. The reference is always run.
+        n_repeats (int): Number of calls of each implementation on each point. The minimum time is kept.
+
+    Returns a list of rows (dicts with keys 'FIELDS'), one per point and implementation. The status is 'ok' if the result agrees with the reference, 'disagreement' if not, 'error' if an exception was raised and 'skipped' if M is too large for the implementation.
+    """
+    names = list(IMPLEMENTATIONS) if implementations is None else [REFERENCE] + [name for name in implementations if name != REFERENCE]
+    for name in names:
+        if name not in IMPLEMENTATIONS:
+            raise ValueError(f"Unknown implementation '{name}'. Possible values are {list(IMPLEMENTATIONS)}.")
+        # The first call compiles the numba kernels, so it is not timed.
+        IMPLEMENTATIONS[name][0](2, 10, .1, 30)
+
+    rows = []
+    for i, (k, m, delta, M) in enumerate(points):
+        point = {'point': i, 'regime': regime(k, m, delta, M), 'k': k, 'm': m, 'M': M, 'delta': delta}
+        reference = None
+        for name in names:
+            row = dict(point, implementation=name, K=None, reference=None, status='ok', time=None, error='')
+            func, max_population = IMPLEMENTATIONS[name]
+            if max_population is not None and M > max_population:
+                row['status'] = 'skipped'
+            else:
+                try:
+                    row['K'], row['time'] = _time(func, (k, m, delta, M), n_repeats)
+                except Exception as error:
+                    row['status'], row['error'] = 'error', f'{type(error).__name__}: {error}'
+            if name == REFERENCE:
+                reference = row['K']
+            row['reference'] = reference
+            if row['status'] == 'ok' and row['K'] != reference:
+                row['status'] = 'disagreement'
+            rows.append(row)
+    return rows
+
+
+def _time(func, args, n_repeats):
+    times = []
+    for _ in range(n_repeats):
+        start = time.perf_counter()
+        result = func(*args)
+        times.append(time.perf_counter() - start)
+    return int(result), min(times)
+
+
+def write_report(rows, path):
+    """
+    Writes the rows returned by 'run_benchmark' to a CSV file.
+    """
+    with open(path, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def read_report(path):
+    """
+    Reads a report written by 'write_report'.
+
+    Returns the list of rows, with the same types as the ones returned by 'run_benchmark'.
+    """
+    rows = []
+    with open(path, newline='') as file:
+        for row in csv.DictReader(file):
+            for key in ('point', 'k', 'm', 'M', 'K', 'reference'):
+                row[key] = int(row[key]) if row[key] else None
+            row['delta'] = float(row['delta'])
+            row['time'] = float(row['time']) if row['time'] else None
+            rows.append(row)
+    return rows
+
+
+def median_times(rows):
+    """
+    Returns a dict mapping (regime, implementation) to the median time of the implementation on the points of the regime where it succeeded.
+    """
+    times = defaultdict(list)
+    for row in rows:
+        if row['time'] is not None:
+            times[row['regime'], row['implementation']].append(row['time'])
+    return {key: float(np.median(value)) for key, value in times.items()}
+
+
+def summarize(rows, baseline=None, slowdown=1.5, max_listed=20):
+    """
+    Renders a compact text summary of a report.
+
+    The table gives the median time in milliseconds of each implementation (columns) in each regime (rows), followed by the fastest implementation of the regime. A cell is marked with '!' if the implementation disagreed with the reference on a point of the regime, with 'E' if it raised an error, and is '-' if it was skipped on every point.
+
+    Args:
+        rows (list of dicts): Rows returned by 'run_benchmark' or 'read_report'.
+        baseline (list of dicts or None): Rows of a previous report. If given, the cells whose median time increased by more than a factor 'slowdown' are listed.
+        slowdown (float): Minimum ratio of the median times to report a slowdown.
+        max_listed (int): Maximum number of disagreements, errors and slowdowns listed.
+
+    Returns the summary as a string.
+    """
+    names = list(dict.fromkeys(row['implementation'] for row in rows))
+    regimes = sorted(set(row['regime'] for row in rows))
+    times = median_times(rows)
+    flags = defaultdict(str)
+    for row in rows:
+        flag = {'disagreement': '!', 'error': 'E'}.get(row['status'], '')
+        if flag and flag not in flags[row['regime'], row['implementation']]:
+            flags[row['regime'], row['implementation']] += flag
+
+    header = ['regime', 'n'] + names + ['fastest']
+    table = [header]
+    for regime_ in regimes:
+        line = [regime_, str(len(set(row['point'] for row in rows if row['regime'] == regime_)))]
+        for name in names:
+            time_ = times.get((regime_, name))
+            line.append(('-' if time_ is None else f'{1000*time_:.3g}') + flags[regime_, name])
+        candidates = [name for name in names if (regime_, name) in times and not flags[regime_, name]]
+        line.append(min(candidates, key=lambda name: times[regime_, name]) if candidates else '-')
+        table.append(line)
+    widths = [max(len(line[j]) for line in table) for j in range(len(header))]
+    lines = ['Median time (ms) per regime'] + ['  '.join(cell.rjust(width) for cell, width in zip(line, widths)) for line in table]
+
+    failures = [row for row in rows if row['status'] in ('disagreement', 'error')]
+    lines.append(f'\n{len(failures)} disagreement(s) or error(s) out of {sum(row["status"] != "skipped" for row in rows)} runs')
+    for row in failures[:max_listed]:
+        outcome = f"K={row['K']} instead of {row['reference']}" if row['status'] == 'disagreement' else row['error']
+        lines.append(f"  {row['implementation']}: k={row['k']}, m={row['m']}, delta={row['delta']:.3g}, M={row['M']}: {outcome}")
+
+    if baseline is not None:
+        baseline_times = median_times(baseline)
+        slowdowns = sorted(((times[key]/baseline_times[key], key) for key in times.keys() & baseline_times.keys() if times[key] > slowdown*baseline_times[key]), reverse=True)
+        lines.append(f'\n{len(slowdowns)} slowdown(s) by more than x{slowdown} with respect to the baseline')
+        for ratio, (regime_, name) in slowdowns[:max_listed]:
+            lines.append(f'  {name} in {regime_}: x{ratio:.2f}')
+
+    return '\n'.join(lines)
+
+
+@func_to_cmd
+def main(n_points=50,
+         seed=0,
+         n_repeats=3,
+         implementations=[],
+         output='benchmark.csv',
+         baseline='',
+         slowdown=1.5):
+    """
+    Runs the benchmark, writes the report and prints its summary.
+
+    Args:
+        n_points (int): Number of random points.
+        seed (int): Seed of the random points. Use the same seed as the baseline to compare the same points.
+        n_repeats (int): Number of calls of each implementation on each point.
+        implementations (list of str): Names of the implementations to run. If empty, all are run.
+        output (str): Path of the CSV report.
+        baseline (str): Path of a previous report to detect slowdowns.
+        slowdown (float): Minimum ratio of the median times to report a slowdown.
+    """
+    rows = run_benchmark(random_points(n_points, seed), implementations or None, n_repeats)
+    write_report(rows, output)
+    print(summarize(rows, read_report(baseline) if baseline else None, slowdown))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+import numpy as np
+import json
+import os
+
+
+class CurveStore:
+    """
+    Compact binary storage of bound curves.
+
+    A store is a directory containing:
+        - 'curves.npy': a single array of shape (n_curves, length) holding one curve per row;
+        - 'done.npy': a boolean array of shape (n_curves,) flagging the rows that have been written;
+        - 'index.json': the parameters of each row, the length and dtype of the curves and optional metadata.
+
+    Curves are read through a memory map, so that accessing a curve returns a view of the file without parsing or copying it. Subsampling a curve (e.g. to plot a few hundred points) only reads the requested points from disk.
+
+    Use 'CurveStore.create' to make a new store and 'CurveStore(path)' to open an existing one.
+    """
+    def __init__(self, path, mode='r'):
+        """
+        Args:
+            path (str): Directory of the store.
+            mode (str, 'r' or 'r+'): Opens the store read-only or for writing.
+        """
+        self.path = path
+        with open(os.path.join(path, 'index.json'), 'r') as file:
+            self.index = json.load(file)
+        self.params = self.index['params']
+        self.metadata = self.index['metadata']
+        self.curves = np.lib.format.open_memmap(os.path.join(path, 'curves.npy'), mode=mode)
+        self.done = np.lib.format.open_memmap(os.path.join(path, 'done.npy'), mode=mode)
+
+    @classmethod
+    def create(cls, path, params, length, dtype=np.float64, metadata=None):
+        """
+        Creates a new empty store. If a store created with the same arguments already exists at 'path', it is opened instead so that its completed rows can be reused.
+
+        Args:
+            path (str): Directory of the store.
+            params (list of dict): Parameters of each curve. Values must be JSON serializable.
+            length (int): Number of points of each curve.
+            dtype (numpy dtype): Type of the stored values. Use np.float32 to halve the size of the store.
+            metadata (dict or None): Any additional JSON serializable information to save with the store.
+
+        Returns the store opened for writing.
+        """
+        index = {
+            'params': [{key: np.asarray(value).tolist() for key, value in p.items()} for p in params],
+            'length': length,
+            'dtype': np.dtype(dtype).str,
+            'metadata': metadata if metadata is not None else {},
+        }
+        index_file = os.path.join(path, 'index.json')
+        if os.path.exists(index_file):
+            with open(index_file, 'r') as file:
+                if json.load(file) != index:
+                    raise ValueError(f"The store at '{path}' was created with different parameters.")
+            return cls(path, mode='r+')
+
+        os.makedirs(path, exist_ok=True)
+        np.lib.format.open_memmap(os.path.join(path, 'curves.npy'), mode='w+', dtype=dtype, shape=(len(params), length))
+        np.lib.format.open_memmap(os.path.join(path, 'done.npy'), mode='w+', dtype=bool, shape=(len(params),))
+        # The index is written last so that an interrupted creation is not mistaken for a valid store.
+        with open(index_file, 'w') as file:
+            json.dump(index, file)
+        return cls(path, mode='r+')
+
+    def __len__(self):
+        return len(self.params)
+
+    def find(self, **params):
+        """
+        Returns the list of the rows whose parameters match all the given parameters.
+        """
+        return [row for row, p in enumerate(self.params) if all(p.get(key) == value for key, value in params.items())]
+
+    def row(self, **params):
+        """
+        Returns the row of the unique curve matching the given parameters.
+        """
+        rows = self.find(**params)
+        if len(rows) != 1:
+            raise KeyError(f'Expected exactly one curve matching {params}, but found {len(rows)}.')
+        return rows[0]
+
+    def curve(self, **params):
+        """
+        Returns a view of the unique curve matching the given parameters.
+        """
+        row = self.row(**params)
+        if not self.done[row]:
+            raise KeyError(f'The curve matching {params} has not been computed yet.')
+        return self.curves[row]
+
+    def mprime_curve(self, **params):
+        """
+        Returns the unique curve matching the given parameters as a dict with keys 'mprime' and 'bound', for stores whose curves hold the bound for mprime = 1, 2, ..., length (such as the stores of 'sweep').
+        """
+        bounds = self.curve(**params)
+        return {'mprime': np.arange(1, len(bounds)+1), 'bound': bounds}
+
+    def write(self, row, curve):
+        """
+        Writes a curve to the given row and flushes it to disk. The row is flagged as done only once the curve is on disk, so that an interrupted write is recomputed when resuming.
+        """
+        self.curves[row] = curve
+        self.curves.flush()
+        self.done[row] = True
+        self.done.flush()
@@ -1,8 +1,9 @@
 import numpy as np
 from scipy.special import binom, erfc
 
-from hypergeo.hypergeometric_distribution import hypergeometric_tail_inverse, hypergeometric_tail_lower_inverse
+from hypergeo.hypergeometric_distribution import hypergeometric_tail_inverse, batch_hypergeometric_tail_inverse, hypergeometric_tail_lower_inverse, _is_feasible, _is_above_lower_inverse, _bisect, _certify_bracket, _narrow_bracket, _bracketed_hypergeometric_tail_inverse
 from hypergeo.binomial_distribution import binomial_tail_inverse
+from hypergeo.utils import log_sauer_shelah
 
 
 def hypinv_upperbound(k,
@@ -46,13 +47,50 @@ def hypinv_upperbound(k,
     return max(1, hypergeometric_tail_inverse(k, m, delta, m+mprime, log_delta)-1-k)/mprime
 
 
+def batch_hypinv_upperbound(k,
+                            m,
+                            growth_function,
+                            delta=0.05,
+                            mprime=None,
+                            log_delta=False):
+    """
+    Vectorized version of 'hypinv_upperbound' for given ghost sample sizes. All parameters are broadcast together.
+
+    Args:
+        k (array of int): Number of errors of the classifier on the sample.
+        m (array of int): Number of examples of the sample.
+        growth_function (callable):
+            Growth function of the hypothesis class. Will receive an array of m+mprime as input and should output an array.
+        delta (array of float): Confidence parameter.
+        mprime (array of int): Ghost sample size. Contrary to 'hypinv_upperbound', it cannot be optimized and must be given.
+        log_delta (bool):
+            If True, it is assumed parameter 'delta' and 'growth_function' are respectively the logarithm of delta and of the growth function (to avoid overflow).
+
+    Returns an array of epsilon, the upper bounds between 0 and 1.
+    """
+    if mprime is None:
+        raise ValueError("Parameter 'mprime' must be given to 'batch_hypinv_upperbound'.")
+    k, m, delta, mprime = np.broadcast_arrays(k, m, delta, mprime)
+
+    if log_delta:
+        delta = delta - np.log(4) - growth_function(m+mprime)
+    else:
+        delta = delta/4/growth_function(m+mprime)
+
+    bounds = np.ones(np.shape(delta))
+    idx = np.broadcast_to(k != m, bounds.shape)
+    k, m, delta, mprime = (np.broadcast_to(x, bounds.shape)[idx] for x in (k, m, delta, mprime))
+    bounds[idx] = np.maximum(1, batch_hypergeometric_tail_inverse(k, m, delta, m+mprime, log_delta)-1-k)/mprime
+    return bounds
+
+
 def hypinv_lowerbound(k,
                       m,
                       growth_function,
                       delta=0.05,
                       mprime=None,
                       max_mprime=None,
-                      **kwargs):
+                      log_delta=False):
     """
     Implements the bound of Theorem 7.
 
@@ -66,6 +104,8 @@ def hypinv_lowerbound(k,
             Ghost sample size. If None, will be optimized for the given inputs. This requires calling growth_function 'max_mprime' times. If too slow, one can use the heuristic value of 4*m as a good guess.
         max_mprime (int):
             Used when optimizing mprime. Will evaluate the best value of mprime within 1 and 'max_mprime'. If None, defaults to 15*m.
+        log_delta (bool):
+            If True, it is assumed parameter 'delta' and 'growth_function' are respectively the logarithm of delta and of the growth function (to avoid underflow).
 
     Returns epsilon, the upper bound between 0 and 1.
     """
@@ -83,11 +123,117 @@ def hypinv_lowerbound(k,
             max_mprime=max_mprime,
             bound=hypinv_lowerbound,
             optimization_mode='max',
+            log_delta=log_delta,
         )
 
-    one_minus_delta = delta/4/growth_function(m+mprime)
+    if log_delta:
+        one_minus_delta = delta - np.log(4) - growth_function(m+mprime)
+    else:
+        one_minus_delta = delta/4/growth_function(m+mprime)
+
+    return min(mprime-1, hypergeometric_tail_lower_inverse(k-1, m, one_minus_delta, m+mprime, log_delta)+1-k)/mprime
+
+
+def hypinv_interval(k,
+                    m,
+                    growth_function,
+                    delta=0.05,
+                    mprime=None,
+                    max_mprime=None,
+                    log_delta=False):
+    """
+    Computes the lower and upper bounds of Theorems 7 and 5 together, giving the same results as 'hypinv_lowerbound' and 'hypinv_upperbound'.
+
+    Args:
+        k (int): Number of errors of the classifier on the sample.
+        m (int): Number of examples of the sample.
+        growth_function (callable):
+            Growth function of the hypothesis class. Will receive m+mprime as input and should output a number.
+        delta (float): Confidence parameter.
+        mprime (int or None):
+            Ghost sample size used by both bounds. If None, it is optimized separately for each bound, but both are evaluated in the same pass over mprime.
+        max_mprime (int):
+            Used when optimizing mprime. Will evaluate the best values of mprime within 1 and 'max_mprime'. If None, defaults to 15*m.
+        log_delta (bool):
+            If True, it is assumed parameter 'delta' and 'growth_function' are respectively the logarithm of delta and of the growth function (to avoid overflow).
+
+    For each mprime, the growth function is evaluated once for both bounds and the upper inverse is searched above the lower one (see '_interval_inverses'). When mprime is optimized, the inverses only move by a few units from one mprime to the next, so each one is searched in a window around the extrapolation of its previous values. The windows are certified with exact evaluations of the tails, so the results are unchanged, but each inverse then requires a few evaluations instead of a full bisection, which cuts the cost of the optimization by much more than half.
+
+    Returns the lower and upper bounds between 0 and 1.
+    """
+    if mprime is not None:
+        K_lower, K_upper = _interval_inverses(k, m, _interval_delta(m, growth_function, delta, mprime, log_delta), m+mprime, log_delta)
+        return _interval_bounds(k, mprime, K_lower, K_upper)
+
+    if max_mprime is None:
+        max_mprime = 15*m
+    best_lower, best_upper = -np.inf, np.inf
+    guesses = [None, None]
+    previous = [None, None]
+    for mprime in range(1, max_mprime+1):
+        inverses = _interval_inverses(k, m, _interval_delta(m, growth_function, delta, mprime, log_delta), m+mprime, log_delta, *guesses)
+        lower, upper = _interval_bounds(k, mprime, *inverses)
+        # Ties are broken in favor of the largest mprime, as in 'optimize_mprime'.
+        best_lower = max(best_lower, lower)
+        best_upper = min(best_upper, upper)
+
+        for side, K in enumerate(inverses):
+            if K is not None:
+                if previous[side] is None:
+                    step, width = 0, 1
+                else:
+                    step = K - previous[side]
+                    width = max(abs(K - guesses[side][0]), 1) if guesses[side] is not None else abs(step) + 1
+                guesses[side] = (K + step, width)
+                previous[side] = K
+
+    return best_lower, best_upper
+
+
+def _interval_delta(m, growth_function, delta, mprime, log_delta):
+    if log_delta:
+        return delta - np.log(4) - growth_function(m+mprime)
+    return delta/4/growth_function(m+mprime)
+
+
+def _interval_bounds(k, mprime, K_lower, K_upper):
+    lower = 0 if K_lower is None else min(mprime-1, K_lower+1-k)/mprime
+    upper = 1 if K_upper is None else max(1, K_upper-1-k)/mprime
+    return lower, upper
 
-    return min(mprime-1, hypergeometric_tail_lower_inverse(k-1, m, one_minus_delta, m+mprime)+1-k)/mprime
+
+def _interval_inverses(k, m, delta, M, log_delta=False, lower_guess=None, upper_guess=None):
+    """
+    Returns HypLowerInv(k-1, m, delta, M) as used by 'hypinv_lowerbound' (None if k == 0) and HypInv(k, m, delta, M) as used by 'hypinv_upperbound' (None if k == m).
+
+    Since P(X >= k) <= delta at the lower inverse, P(X <= k) >= 1 - delta > delta for delta < 1/2, so that the lower inverse is infeasible for the upper inverse and bounds its search from below.
+
+    Each guess is either None or a tuple (K, width) of a window in which the inverse is expected to be. The window is certified with '_certify_bracket' before bisecting inside it.
+    """
+    K_lower = None
+    if k > 0:
+        if lower_guess is None:
+            K_lower = hypergeometric_tail_lower_inverse(k-1, m, delta, M, log_delta)
+        else:
+            K, width = lower_guess
+            is_above = lambda K: _is_above_lower_inverse(k-1, m, K, M, delta, log_delta)
+            K_min, K_max = _certify_bracket(is_above, K - width, K + width + 1, k-1, M-m+k)
+            K_lower = _bisect(is_above, K_min, K_max) - 1
+
+    K_upper = None
+    if k < m:
+        K_min, K_max = k, M-m+k+1
+        if K_lower is not None and (np.exp(delta) if log_delta else delta) < .5:
+            K_min = max(K_min, min(K_lower, K_max-1))
+        if upper_guess is None:
+            K_min, K_max = _narrow_bracket(k, m, delta, M, K_min, K_max, log_delta)
+        else:
+            K, width = upper_guess
+            is_feasible = lambda K: _is_feasible(k, m, K, M, delta, log_delta)
+            K_min, K_max = _certify_bracket(is_feasible, K - width - 1, K + width, K_min, K_max)
+        K_upper = _bracketed_hypergeometric_tail_inverse(k, m, delta, M, K_min, K_max, log_delta)
+
+    return K_lower, K_upper
 
 
 def hypinv_reldev_upperbound(k,
@@ -148,28 +294,173 @@ def optimize_mprime(k,
                     optimization_mode='min',
                     early_stopping=np.inf,
                     return_bound=False,
-                    log_delta=False):
-    steps_since_last_best = 0
-    bounds = np.ones(max_mprime - min_mprime + 1)
-    best_bound = 1
-    best_mprime = min_mprime
+                    log_delta=False,
+                    search='linear',
+                    ratio_range=(1, 32),
+                    ratio_step=2**.25,
+                    return_n_evaluations=False):
+    """
+    Optimizes the ghost sample size mprime of a bound.
+
+    Args:
+        k (int): Number of errors of the classifier on the sample.
+        m (int or float): Number of examples of the sample. Can be a float with the 'ratio' search (to avoid integer overflows in the growth function), in which case mprime is returned as a float with an integral value.
+        growth_function (callable): Growth function of the hypothesis class, passed to the bound.
+        delta (float): Confidence parameter.
+        max_mprime (int): Largest value of mprime evaluated by the 'linear' search.
+        min_mprime (int): Smallest value of mprime evaluated by the 'linear' search.
+        bound (callable): Bound to optimize, with the signature of 'hypinv_upperbound'.
+        optimization_mode (str, 'min' or 'max'): Whether the bound should be minimized or maximized.
+        early_stopping (int): The 'linear' search stops after this number of values of mprime without improvement.
+        return_bound (bool): If True, the value of the bound at the optimal mprime is also returned.
+        log_delta (bool): If True, it is assumed parameter 'delta' and 'growth_function' are respectively the logarithm of delta and of the growth function (to avoid overflow).
+        search (str, 'linear' or 'ratio'):
+            With 'linear', every mprime between 'min_mprime' and 'max_mprime' is evaluated (unless early stopped), which requires O(m) evaluations of the bound.
+            With 'ratio', the ratio mprime/m is searched instead on the geometric grid ratio_range[0] * ratio_step**i, which stops at the first value worse than the best one. The search is then refined around the best ratio by steps of sqrt(ratio_step), ratio_step**(1/4), ... until mprime is found up to one unit. This requires O(log(m)) evaluations of the bound, but finds a local optimum only (up to the plateaus of the bound, which is a staircase in mprime). Parameters 'min_mprime', 'max_mprime' and 'early_stopping' are ignored.
+        ratio_range (tuple of float): Smallest and largest ratios mprime/m of the grid of the 'ratio' search.
+        ratio_step (float): Factor between consecutive ratios of the grid of the 'ratio' search.
+        return_n_evaluations (bool): If True, the number of evaluations of the bound is also returned.
+
+    Returns the optimal mprime, followed by the optimal bound if 'return_bound' is True and by the number of evaluations of the bound if 'return_n_evaluations' is True.
+    """
     sign = 1 if optimization_mode == 'min' else -1
-    for i, mprime in enumerate(range(min_mprime, max_mprime+1)):
+    if search == 'linear':
+        best_mprime, best_bound, n_evaluations, _ = _linear_mprime_search(k, m, growth_function, delta, min_mprime, max_mprime, bound, sign, early_stopping, log_delta)
+    elif search == 'ratio':
+        best_mprime, best_bound, n_evaluations = _ratio_mprime_search(k, m, growth_function, delta, bound, sign, ratio_range, ratio_step, log_delta)
+    else:
+        raise ValueError(f"Unknown search '{search}'. Possible values are 'linear' and 'ratio'.")
+
+    result = (best_mprime,)
+    if return_bound:
+        result += (best_bound,)
+    if return_n_evaluations:
+        result += (n_evaluations,)
+    return result[0] if len(result) == 1 else result
+
+
+def _linear_mprime_search(k, m, growth_function, delta, min_mprime, max_mprime, bound, sign, early_stopping, log_delta, best_mprime=None, best_bound=None, steps_since_last_best=0):
+    """
+    Linear search of 'optimize_mprime'. The search can be resumed from the state (best_mprime, best_bound, steps_since_last_best) returned by a search over the previous values of mprime, which splits it into chunks.
+    """
+    if best_mprime is None:
+        best_mprime = min_mprime
+        best_bound = 1 if sign == 1 else 0
+    n_evaluations = 0
+    if steps_since_last_best >= early_stopping:
+        return best_mprime, best_bound, n_evaluations, steps_since_last_best
+    for mprime in range(min_mprime, max_mprime+1):
         bound_value = bound(k, m, growth_function, delta, mprime, log_delta=log_delta)
-        bounds[i] = bound_value
+        n_evaluations += 1
         if sign*bound_value <= sign*best_bound:
             best_bound = bound_value
             best_mprime = mprime
             steps_since_last_best = 0
         steps_since_last_best += 1
         if steps_since_last_best >= early_stopping:
-            # print(f'early stopped after {i} iterations')
             break
+    return best_mprime, best_bound, n_evaluations, steps_since_last_best
 
-    if not return_bound:
-        return best_mprime
-    else:
-        return best_mprime, best_bound
+
+def _ratio_mprime_search(k, m, growth_function, delta, bound, sign, ratio_range, ratio_step, log_delta):
+    """
+    Coarse-to-fine search of 'optimize_mprime' over the ratio mprime/m. Ties are broken in favor of the largest mprime, as in the linear search.
+    """
+    bounds = {}
+    def evaluate(ratio):
+        mprime = max(1, round(ratio*m))
+        if isinstance(m, float): # Keeps float arithmetic in the growth function for huge samples
+            mprime = float(mprime)
+        if mprime not in bounds:
+            bounds[mprime] = bound(k, m, growth_function, delta, mprime, log_delta=log_delta)
+        return mprime
+    def key(mprime):
+        return sign*bounds[mprime], -mprime
+
+    min_ratio, max_ratio = ratio_range
+    best_mprime = evaluate(min_ratio)
+    ratio = min_ratio
+    while ratio*ratio_step <= max_ratio*(1 + 1e-12):
+        ratio *= ratio_step
+        mprime = evaluate(ratio)
+        if sign*bounds[mprime] > sign*bounds[best_mprime]:
+            break
+        best_mprime = min(best_mprime, mprime, key=key)
+
+    step = ratio_step
+    while (step - 1)*best_mprime >= 1:
+        step = np.sqrt(step)
+        best_ratio = best_mprime/m
+        for ratio in (best_ratio/step, best_ratio*step):
+            if min_ratio <= ratio <= max_ratio:
+                best_mprime = min(best_mprime, evaluate(ratio), key=key)
+
+    return best_mprime, bounds[best_mprime], len(bounds)
+
+
+def hypinv_sample_complexity(epsilon,
+                             risk,
+                             d=None,
+                             delta=0.05,
+                             growth_function=None,
+                             max_m=10**9,
+                             ratio_range=(1, 32),
+                             ratio_step=2**.25):
+    """
+    Finds the smallest sample size m for which the bound of Theorem 5 (see 'hypinv_upperbound') guarantees that the true risk exceeds the empirical risk by at most epsilon.
+
+    Args:
+        epsilon (float): Target deviation between the bound on the true risk and the empirical risk.
+        risk (float in [0, 1)): Expected empirical risk of the classifier. The number of errors on m examples is taken as k = round(risk*m).
+        d (int): VC dimension of the hypothesis class. Used for the growth function given by Sauer-Shelah's lemma if 'growth_function' is None.
+        delta (float): Confidence parameter.
+        growth_function (callable or None): Logarithm of the growth function of the hypothesis class, which will receive m+mprime as input. If None, 'log_sauer_shelah(d)' is used. For example, 'exact_log_sauer_shelah(d)' gives a tighter bound.
+        max_m (int): Largest sample size considered. A ValueError is raised if the target is not reached at 'max_m'.
+        ratio_range (tuple of float): Smallest and largest ratios mprime/m, passed to the 'ratio' search of 'optimize_mprime'.
+        ratio_step (float): Factor between consecutive ratios of the 'ratio' search.
+
+    The sample size is found by an exponential search followed by a binary search, which assumes that the deviation decreases with m (up to the rounding of k). For each m, mprime is optimized with the 'ratio' search of 'optimize_mprime'. Since the optimal ratio mprime/m changes slowly with m, the search starts two grid steps below the optimal ratio of the last m evaluated instead of at ratio_range[0], which saves most of the coarse steps of the sample sizes reaching the target.
+
+    NOTE: The 'ratio' search only finds a local optimum of mprime, which depends on its starting ratio. With the warm start, a sample size could thus be rejected or accepted depending on the values of m evaluated before it. To avoid rejecting a sample size only because of the warm start, a miss is confirmed by a 'ratio' search from ratio_range[0], as a call to 'optimize_mprime' would do. The sample size m-1 thus misses the target with 'optimize_mprime(..., search='ratio')', although a linear search over mprime, which finds the global optimum, may reach it with fewer examples. An accepted m may still come with a better mprime than the one found from scratch, but the returned pair (m, mprime) always reaches the target.
+
+    Returns m and the optimal mprime for this m.
+    """
+    log_delta = np.log(delta)
+    if growth_function is None:
+        growth_function = log_sauer_shelah(d)
+    last_ratio = ratio_range[0]
+
+    def deviation(m):
+        nonlocal last_ratio
+        k = int(round(risk*m))
+        def search(min_ratio):
+            mprime, bound = optimize_mprime(k, m, growth_function, log_delta, return_bound=True, log_delta=True, search='ratio', ratio_range=(min_ratio, ratio_range[1]), ratio_step=ratio_step)
+            return bound - k/m, mprime
+        min_ratio = min(max(ratio_range[0], last_ratio/ratio_step**2), ratio_range[1])
+        value, mprime = search(min_ratio)
+        if value > epsilon and min_ratio > ratio_range[0]:
+            value, mprime = search(ratio_range[0]) # A miss is confirmed by a search from scratch.
+        last_ratio = mprime/m
+        return value, mprime
+
+    # Exponential search of a sample size reaching the target, then binary search on (m_min, m_max].
+    m_min, m_max = 0, 1
+    value, mprime = deviation(m_max)
+    while value > epsilon:
+        if m_max >= max_m:
+            raise ValueError(f'The deviation {epsilon} is not reached with m <= {max_m} examples.')
+        m_min, m_max = m_max, min(2*m_max, max_m)
+        value, mprime = deviation(m_max)
+
+    while m_max - m_min > 1:
+        m = (m_min + m_max)//2
+        value, mprime_m = deviation(m)
+        if value <= epsilon:
+            m_max, mprime = m, mprime_m
+        else:
+            m_min = m
+
+    return m_max, mprime
 
 
 def vapnik_pessismistic_bound(k, m, growth_function, delta, log_delta=False):
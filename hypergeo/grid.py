@@ -0,0 +1,194 @@
+import numpy as np
+import xarray as xr
+import inspect
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from hypergeo.generalization_bounds import hypinv_upperbound, batch_hypinv_upperbound, vapnik_pessismistic_bound, vapnik_relative_deviation_bound, catoni_4_6, lugosi_chaining
+from hypergeo.utils import sauer_shelah
+
+
+_vectorized_bounds = {}
+
+
+def register_vectorized(bound, implementation=None, requires=()):
+    """
+    Registers a vectorized implementation of a bound to be used by 'evaluate_grid'.
+
+    Args:
+        bound (callable): Scalar bound function.
+        implementation (callable or None): Function taking the same keyword arguments as 'bound', each being a 1-D array of the same length, and returning an array of bound values of that length. If None, 'bound' is assumed to already support arrays.
+        requires (iterable of str): Parameters that must be given for the implementation to be valid (e.g. 'mprime' if the scalar bound optimizes it when it is missing).
+    """
+    _vectorized_bounds[bound] = (implementation or bound, set(requires))
+
+
+register_vectorized(hypinv_upperbound, batch_hypinv_upperbound, requires=['mprime'])
+register_vectorized(vapnik_pessismistic_bound)
+register_vectorized(vapnik_relative_deviation_bound)
+register_vectorized(catoni_4_6, requires=['mprime'])
+register_vectorized(lugosi_chaining)
+
+
+def _bound_kwargs(bound, params):
+    """
+    Translates the grid parameters into keyword arguments of the bound. If the bound expects a growth function and the VC dimension 'd' is given instead, the growth function is bounded using Sauer-Shelah's lemma.
+    """
+    kwargs = dict(params)
+    signature = inspect.signature(bound).parameters
+    if 'growth_function' in signature and 'd' not in signature and 'd' in kwargs:
+        kwargs['growth_function'] = sauer_shelah(kwargs.pop('d'))
+    return kwargs
+
+
+def _evaluate_point(bound, params):
+    return bound(**_bound_kwargs(bound, params))
+
+
+def _as_data_array(name, value):
+    if isinstance(value, xr.DataArray):
+        return value
+    value = np.asarray(value)
+    if value.ndim == 0:
+        return xr.DataArray(value)
+    if value.ndim == 1:
+        return xr.DataArray(value, dims=[name], coords={name: value})
+    raise ValueError(f"Parameter '{name}' must be a scalar, a 1-D array or an xarray.DataArray, but has {value.ndim} dimensions.")
+
+
+def evaluate_grid(bound, n_workers=None, chunk_size=100_000, path=None, **params):
+    """
+    Evaluates a bound on the grid formed by its parameters.
+
+    Each parameter can be a scalar, a 1-D array or an xarray.DataArray. 1-D arrays become a dimension named after the parameter, and DataArrays are broadcast along their own dimensions, which allows parameters that depend on each other (e.g. k=xr.DataArray(ks, dims='m', coords={'m': ms}) with m=xr.DataArray(ms, dims='m', coords={'m': ms})). If the bound expects a growth function, one can give the VC dimension 'd' instead, in which case Sauer-Shelah's lemma is used.
+
+    Bounds with a registered vectorized implementation (see 'register_vectorized') are evaluated chunk by chunk on arrays. Other bounds are evaluated point by point in a pool of processes. The parameters (before broadcasting) and the results are then placed in shared memory (or in the memory-mapped file if 'path' is given), so that the workers only receive ranges of flat indices and write their results in place, without any serialization of the points.
+
+    Args:
+        bound (callable): Bound to evaluate, e.g. 'hypinv_upperbound'. Must be picklable if evaluated in a pool of processes.
+        n_workers (int or None): Number of processes used for non-vectorized bounds. If None, defaults to the number of CPUs. If 1, the points are evaluated in the current process.
+        chunk_size (int): Number of points evaluated at once. Only one chunk of parameters is materialized in memory at a time.
+        path (str or None): If given, the results are written chunk by chunk to a memory-mapped .npy file at this path instead of being held in memory, so that grids larger than memory can be evaluated.
+        params: Parameters of the bound, e.g. k, m, d, delta, mprime.
+
+    Returns an xarray.DataArray named after the bound, with one dimension per non-scalar parameter.
+    """
+    # The parameters are aligned on their coordinates before being compacted for the workers, as 'xr.broadcast' does.
+    arrays = xr.align(*(_as_data_array(name, value) for name, value in params.items()), join='outer')
+    broadcast_arrays = xr.broadcast(*arrays)
+    dims, shape = broadcast_arrays[0].dims, broadcast_arrays[0].shape
+    coords = {}
+    for array in broadcast_arrays:
+        coords.update(array.coords)
+    grid_shape = shape or (1,)
+    size = int(np.prod(grid_shape))
+
+    if path is not None:
+        results = np.lib.format.open_memmap(path, mode='w+', dtype=np.float64, shape=grid_shape)
+    else:
+        results = np.empty(grid_shape)
+
+    implementation, requires = _vectorized_bounds.get(bound, (None, set()))
+    if implementation is not None and not requires <= set(params):
+        implementation = None
+
+    if implementation is None and n_workers != 1:
+        compact_values = [_compact_values(array, dims, grid_shape) for array in arrays]
+        _evaluate_in_pool(bound, dict(zip(params, compact_values)), grid_shape, results, path, n_workers or os.cpu_count(), chunk_size)
+    else:
+        values = [array.values.reshape(grid_shape) for array in broadcast_arrays] # Broadcast views, not copies
+        flat_results = results.reshape(-1)
+        for start in range(0, size, chunk_size):
+            idx = np.unravel_index(np.arange(start, min(start + chunk_size, size)), grid_shape)
+            chunk = {name: value[idx] for name, value in zip(params, values)}
+            if implementation is not None:
+                flat_results[start:start + chunk_size] = implementation(**_bound_kwargs(bound, chunk))
+            else:
+                flat_results[start:start + chunk_size] = _evaluate_points(bound, chunk)
+
+    if path is not None:
+        results.flush()
+
+    return xr.DataArray(results.reshape(shape), coords=coords, dims=dims, name=bound.__name__)
+
+
+def _evaluate_points(bound, chunk):
+    n_points = len(next(iter(chunk.values())))
+    return [_evaluate_point(bound, {name: value[i].item() for name, value in chunk.items()}) for i in range(n_points)]
+
+
+def _compact_values(array, dims, grid_shape):
+    """
+    Returns the values of a parameter with one axis per dimension of the grid, of length 1 along the dimensions the parameter does not depend on, so that it can be broadcast to the grid without being copied.
+    """
+    values = array.transpose(*[dim for dim in dims if dim in array.dims]).values
+    values = values.reshape([length if dim in array.dims else 1 for dim, length in zip(dims, grid_shape)] or [1])
+    if values.dtype.hasobject:
+        raise TypeError("Parameters must be numbers or strings to be shared with the worker processes.")
+    return values
+
+
+def _evaluate_in_pool(bound, compact_values, grid_shape, results, path, n_workers, chunk_size):
+    """
+    Evaluates the grid in a pool of processes which read the parameters from shared memory and write the results in place.
+    """
+    blocks = []
+    try:
+        inputs = {}
+        for name, values in compact_values.items():
+            block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+            blocks.append(block)
+            np.ndarray(values.shape, values.dtype, buffer=block.buf)[...] = values
+            inputs[name] = (block.name, values.shape, values.dtype.str)
+
+        if path is not None:
+            output = ('file', os.fspath(path))
+        else:
+            block = shared_memory.SharedMemory(create=True, size=results.nbytes)
+            blocks.append(block)
+            output = ('shared_memory', block.name)
+
+        size = int(np.prod(grid_shape))
+        range_size = max(1, min(chunk_size, size//(4*n_workers)))
+        ranges = [(start, min(start + range_size, size)) for start in range(0, size, range_size)]
+        with ProcessPoolExecutor(n_workers, initializer=_init_worker, initargs=(bound, inputs, output, grid_shape)) as executor:
+            for _ in executor.map(_evaluate_range, [start for start, _ in ranges], [stop for _, stop in ranges]):
+                pass
+
+        if path is None:
+            results[...] = np.ndarray(grid_shape, np.float64, buffer=blocks[-1].buf)
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+_worker = {}
+
+def _init_worker(bound, inputs, output, grid_shape):
+    results = np.load(output[1], mmap_mode='r+').reshape(-1) if output[0] == 'file' else None
+    _worker.update(bound=bound, inputs=inputs, output=output, results=results, grid_shape=grid_shape)
+
+
+def _evaluate_range(start, stop):
+    """
+    Evaluates the points of the flattened grid in [start, stop). The shared memory blocks are attached only while reading the parameters and writing the results, and closed right after, so that the workers never keep them open.
+    """
+    grid_shape = _worker['grid_shape']
+    idx = np.unravel_index(np.arange(start, stop), grid_shape)
+    chunk = {}
+    for name, (block_name, shape, dtype) in _worker['inputs'].items():
+        block = shared_memory.SharedMemory(name=block_name)
+        values = np.broadcast_to(np.ndarray(shape, dtype, buffer=block.buf), grid_shape)
+        chunk[name] = values[idx] # Copy, so that the block can be closed
+        del values
+        block.close()
+
+    results = _evaluate_points(_worker['bound'], chunk)
+    if _worker['results'] is not None:
+        _worker['results'][start:stop] = results
+    else:
+        block = shared_memory.SharedMemory(name=_worker['output'][1])
+        np.ndarray(grid_shape, np.float64, buffer=block.buf).reshape(-1)[start:stop] = results
+        block.close()
@@ -1,5 +1,5 @@
 import numpy as np
-from scipy.special import comb, gammaln
+from scipy.special import comb, gammaln, ndtri, ndtri_exp
 from scipy.stats import hypergeom
 import math
 
@@ -8,6 +8,8 @@ warnings.filterwarnings('error')
 
 
 from hypergeo.utils import close_to, close_to_or_less_than
+from hypergeo.binomial_distribution import binomial_tail_inverse
+from hypergeo import jit
 
 
 def binomln(m, k):
@@ -71,10 +73,78 @@ def log_hypergeometric_tail(k, m, K, M):
     return hypergeom.logcdf(k, M, K, m)
 
 
+def chunked_log_hypergeometric_tail(k, m, K, M, rtol=1e-15, chunk_size=4096):
+    """
+    Logarithm of the hypergeometric distribution tail, computed independently of scipy by summing the probability mass function. Useful to validate faster implementations for very large populations.
+
+    Args:
+        k (int): Number of errors observed.
+        m (int): Sample size.
+        K (int): Number of errors in the whole population.
+        M (int): Population size.
+        rtol (float): Relative tolerance on the CDF. The summation stops once the remaining terms are provably smaller than rtol times the current sum.
+        chunk_size (int): Number of terms computed at once, which bounds the memory usage.
+
+    The summation starts from the largest term of the tail, hyp(j*, m, K, M) with j* = min(k, mode), whose logarithm is computed accurately by '_log_comb_sum' (differences of 'gammaln' lose up to 10e-9 for populations in the millions). The other terms are obtained relative to it by chunks, with cumulative sums of the logarithms of the ratios of consecutive terms, going downward from j* and, if k is above the mode, upward from j* to k. In both directions the terms decrease with ratios which decrease too, so the remaining terms are bounded by a geometric series, which gives the stopping criterion. Each chunk is added in linear scale with 'math.fsum'.
+
+    Returns the logarithm of the CDF.
+    """
+    j_min = max(0, m - M + K)
+    if k < j_min:
+        return -np.inf
+    if k >= min(m, K):
+        return 0.
+
+    mode = (m+1)*(K+1)//(M+2)
+    j_star = max(min(k, mode), j_min)
+    log_anchor = _log_comb_sum(K, j_star) + _log_comb_sum(M-K, m-j_star) - _log_comb_sum(M, m)
+
+    # Downward: hyp(j-1)/hyp(j) = j(M-K-m+j) / ((K-j+1)(m-j+1)).
+    chunk_sums = [1.]
+    j, log_term = j_star, 0.
+    while j > j_min:
+        js = np.arange(j, max(j - chunk_size, j_min), -1, dtype=np.float64)
+        log_terms = log_term + np.cumsum(np.log(js*(M-K-m+js) / ((K-js+1)*(m-js+1))))
+        chunk_sums.append(math.fsum(np.exp(log_terms)))
+        j, log_term = int(js[-1]) - 1, log_terms[-1]
+        ratio = j*(M-K-m+j) / ((K-j+1)*(m-j+1)) if j > j_min else 0
+        if ratio < 1 and math.exp(log_term)*ratio/(1-ratio) <= rtol*math.fsum(chunk_sums):
+            break
+
+    # Upward: hyp(j+1)/hyp(j) = (K-j)(m-j) / ((j+1)(M-K-m+j+1)).
+    j, log_term = j_star, 0.
+    while j < k:
+        js = np.arange(j, min(j + chunk_size, k), dtype=np.float64)
+        log_terms = log_term + np.cumsum(np.log((K-js)*(m-js) / ((js+1)*(M-K-m+js+1))))
+        chunk_sums.append(math.fsum(np.exp(log_terms)))
+        j, log_term = int(js[-1]) + 1, log_terms[-1]
+        ratio = (K-j)*(m-j) / ((j+1)*(M-K-m+j+1)) if j < k else 0
+        if ratio < 1 and math.exp(log_term)*ratio/(1-ratio) <= rtol*math.fsum(chunk_sums):
+            break
+
+    return log_anchor + math.log(math.fsum(chunk_sums))
+
+
+def _log_comb_sum(n, k, chunk_size=4096):
+    """
+    Logarithm of the binomial coefficient computed as the sum of log((n-k+i)/i) for i from 1 to min(k, n-k), by chunks and with 'math.fsum'. It is accurate to a few ulps of the result, but takes O(min(k, n-k)) operations.
+    """
+    k = min(k, n-k)
+    partial_sums = []
+    for start in range(1, k+1, chunk_size):
+        i = np.arange(start, min(start + chunk_size, k+1), dtype=np.float64)
+        partial_sums.append(math.fsum(np.log((n-k+i)/i)))
+    return math.fsum(partial_sums)
+
+
 def hypergeometric_lower_tail(k, m, K, M):
     return hypergeom.sf(k, M, K, m)
 
 
+def log_hypergeometric_lower_tail(k, m, K, M):
+    return hypergeom.logsf(k, M, K, m)
+
+
 def berkopec_single_term(k, m, K, M):
     """
     Computes a single term of Berkopec's formula for the hypergeometric cumulative distribution function. Berkopec's formula is:
@@ -130,7 +200,7 @@ def hypergeometric_berkopec_tail(k, m, K, M):
     return sum(berkopec_unnormalized_single_term(k, m, J, M) for J in range(K, M-m+k+1)) / comb(M, m, exact=True)
 
 
-def hypergeometric_tail_inverse(k, m, delta, M, log_delta=False):
+def hypergeometric_tail_inverse(k, m, delta, M, log_delta=False, backend=None):
     """
     Computes the pseudo-inverse of the hypergeometric distribution tail:
         HypInv(k, m, delta, M) = min{ K : Hyp(k, m, K, M) <= delta },
@@ -142,13 +212,88 @@ def hypergeometric_tail_inverse(k, m, delta, M, log_delta=False):
         delta (float): Confidence parameter threshold.
         M (int): Population size.
         log_delta (bool): Whether or not parameter 'delta' is the logarithm of delta to avoid overflow.
+        backend (str, 'auto', 'numba', 'python' or None): Backend used for the bisection. If None, the default backend of 'hypergeo.jit' is used. See the doc of 'hypergeo.jit' for more info.
 
     Implements a bisection algorithm to find the pseudo-inverse in O(k log(M-m)), as opposed to the other algorithms which are in Θ(M-m). The bisection is adjusted to deal with the discrete nature of the hypergeometric tail.
 
+    When M - m >> m, the search is first narrowed to a bracket of width about m given by binomial bounds on the tail (see '_binomial_bracket'). For very large populations, it is further narrowed with a normal approximation (see 'asymptotic_hypergeometric_tail_inverse'). Both brackets are certified, so the result is unchanged.
+
     Returns K the number of errors in the whole population with probability 1 - delta.
     """
-    K_min = k
-    K_max = M - m + k + 1
+    K_min, K_max = _narrow_bracket(k, m, delta, M, k, M - m + k + 1, log_delta)
+    return _bracketed_hypergeometric_tail_inverse(k, m, delta, M, K_min, K_max, log_delta, backend)
+
+
+def _narrow_bracket(k, m, delta, M, K_min, K_max, log_delta=False):
+    """
+    Narrows the bracket (K_min, K_max] of 'hypergeometric_tail_inverse' with the binomial and asymptotic brackets, depending on the size of the population.
+    """
+    if M - m >= BINOMIAL_MIN_RATIO*m:
+        K_min, K_max = _binomial_bracket(k, m, delta, M, K_min, K_max, log_delta)
+    if M - m >= ASYMPTOTIC_MIN_POPULATION:
+        K_min, K_max = _asymptotic_bracket(k, m, delta, M, K_min, K_max, log_delta)
+    return K_min, K_max
+
+
+def hypergeometric_tail_inverse_profile(m, delta, M, log_delta=False, backend=None):
+    """
+    Computes the pseudo-inverse of the hypergeometric distribution tail HypInv(k, m, delta, M) for all k = 0, ..., m in a single sweep.
+
+    Args:
+        m (int): Sample size.
+        delta (float): Confidence parameter threshold.
+        M (int): Population size.
+        log_delta (bool): Whether or not parameter 'delta' is the logarithm of delta to avoid overflow.
+        backend (str, 'auto', 'numba', 'python' or None): Backend used for the evaluations of the CDF. See the doc of 'hypergeo.jit' for more info.
+
+    The pseudo-inverse is nondecreasing in k: if K is the answer for k-1, then K-1 is infeasible for k-1 and thus for k, since the CDF is nondecreasing in k. The search for k is therefore restricted to (K-1, M-m+k+1]. Moreover, the increments of the answer vary slowly with k, so the answer for k is guessed by extrapolating the last increment, in a window as wide as the error of the previous guess. The window is certified with '_certify_bracket' (which gallops away from the guess by doubling steps if needed) and the bisection only runs inside it. The number of evaluations of the CDF for k is thus logarithmic in the error of the guess instead of in M-m, so that the whole sweep costs O(m + M-m) evaluations in the worst case and typically a few per k, as opposed to O(m log(M-m)) for independent calls to 'hypergeometric_tail_inverse'.
+
+    Returns an array of length m+1 of the number of errors in the whole population with probability 1 - delta for each k.
+    """
+    Ks = np.empty(m+1, dtype=np.int64)
+    K, step, width = 0, 0, 1
+    for k in range(m+1):
+        is_feasible = lambda K: _is_feasible(k, m, K, M, delta, log_delta, backend)
+        K_guess = K + step
+        K_min, K_max = _certify_bracket(is_feasible, K_guess - width, K_guess + width, max(k, K-1), M - m + k + 1)
+        K_next = _bracketed_hypergeometric_tail_inverse(k, m, delta, M, K_min, K_max, log_delta, backend)
+        width = max(abs(K_next - K_guess), 1)
+        K, step = K_next, K_next - K
+        Ks[k] = K
+    return Ks
+
+
+def _bracketed_hypergeometric_tail_inverse(k, m, delta, M, K_min, K_max, log_delta=False, backend=None):
+    """
+    Finds the pseudo-inverse on the bracket (K_min, K_max], where K_min is known to be infeasible and K_max to be feasible, with the compiled bisection if available and scipy otherwise.
+    """
+    if jit.use_numba(backend) and _is_integral(k, m, M, K_min, K_max):
+        K_min, K_max, done = jit.tail_inverse_bisection(int(k), int(m), float(delta), int(M), log_delta, int(K_min), int(K_max))
+        if done:
+            return K_max
+    return _hypergeometric_tail_inverse_bisection(k, m, delta, M, K_min, K_max, log_delta)
+
+
+def _is_integral(*values):
+    return all(isinstance(value, (int, np.integer)) for value in values)
+
+
+def _is_feasible(k, m, K, M, delta, log_delta=False, backend=None):
+    """
+    Returns True if Hyp(k, m, K, M) <= delta, with the same tolerance as in 'hypergeometric_tail_inverse'. The compiled kernel is used if available, unless the comparison is too close to be decided by it.
+    """
+    if jit.use_numba(backend) and _is_integral(k, m, K, M):
+        feasibility = jit.tail_feasibility(int(k), int(m), int(K), int(M), float(delta), log_delta)
+        if feasibility >= 0:
+            return feasibility == 1
+    hyp_cdf = hypergeom.logcdf(k, M, K, m) if log_delta else hypergeom.cdf(k, M, K, m)
+    return not (hyp_cdf > delta and not close_to(hyp_cdf, delta, atol=0, rtol=10e-16))
+
+
+def _hypergeometric_tail_inverse_bisection(k, m, delta, M, K_min, K_max, log_delta=False):
+    """
+    Bisection of 'hypergeometric_tail_inverse' with scipy on the bracket (K_min, K_max], where K_min is known to be infeasible and K_max to be feasible.
+    """
     K_mid = (K_max + K_min + 1)//2
     # hyp_cdf = hypergeometric_tail(k, m, K_mid, M)
     if log_delta:
@@ -167,7 +312,184 @@ def hypergeometric_tail_inverse(k, m, delta, M, log_delta=False):
     return K_max
 
 
-def hypergeometric_tail_lower_inverse(k, m, one_minus_delta, M):
+# Ratios (M-m)/m from which 'hypergeometric_tail_inverse' narrows the search with binomial brackets.
+BINOMIAL_MIN_RATIO = 16
+
+
+def _binomial_bracket(k, m, delta, M, K_min, K_max, log_delta=False):
+    """
+    Narrows the bracket (K_min, K_max] of the pseudo-inverse using binomial bounds on the hypergeometric tail, which are much cheaper to invert than the hypergeometric CDF.
+
+    When sampling m elements without replacement, the probability that each draw is an error lies between p_lo = (K-m+1)/(M-m+1) and p_hi = K/(M-m+1) whatever the previous draws. Hence, the number of errors is stochastically between binomial variables and
+        Bin(k, m, p_hi) <= Hyp(k, m, K, M) <= Bin(k, m, p_lo).
+    With p the binomial tail inverse of delta, K is then feasible as soon as p_lo >= p and infeasible as long as p_hi < p, which gives a window of width about m. Since the binomial tail loses accuracy far in the tails, the ends of the window are certified with exact evaluations of the CDF.
+    """
+    linear_delta = math.exp(delta) if log_delta else delta
+    if not 0 < linear_delta < 1 or k >= m:
+        return K_min, K_max
+
+    N = M - m + 1
+    p = binomial_tail_inverse(k, m, linear_delta)
+    slack = math.ceil(1e-9*p*N) + 1
+    K_lo = math.ceil(p*N) - 1 - slack
+    K_hi = math.ceil(p*N) + m - 1 + slack
+    return _certify_bracket(lambda K: _is_feasible(k, m, K, M, delta, log_delta), K_lo, K_hi, K_min, K_max)
+
+
+# Populations from which 'hypergeometric_tail_inverse' starts from the normal approximation.
+ASYMPTOTIC_MIN_POPULATION = 2**20
+
+
+def asymptotic_hypergeometric_tail_inverse(k, m, delta, M, log_delta=False, backend=None):
+    """
+    Computes the pseudo-inverse of the hypergeometric distribution tail for very large populations, starting from a normal approximation of the hypergeometric tail. The result is exactly the same as the one of 'hypergeometric_tail_inverse'.
+
+    Args:
+        k (int): Number of errors observed.
+        m (int): Sample size.
+        delta (float): Confidence parameter threshold.
+        M (int): Population size.
+        log_delta (bool): Whether or not parameter 'delta' is the logarithm of delta to avoid overflow.
+        backend (str, 'auto', 'numba', 'python' or None): Backend used for the final bisection. See the doc of 'hypergeo.jit' for more info.
+
+    The normal approximation with continuity correction of the CDF has an error of order 1/σ, where σ^2 = m p(1-p)(M-m)/(M-1) is the variance of the number of errors with p = K/M (Berry-Esseen bound). The window of K such that the approximation is within 1/σ of delta is then certified with exact evaluations of the CDF at its ends (and widened by doubling if one of them fails), so that the exact bisection only runs inside the window. The bound thus only affects the number of exact evaluations and never the result. With M of the order of 10^7, this typically reduces the number of exact evaluations of the CDF by half.
+
+    Returns K the number of errors in the whole population with probability 1 - delta.
+    """
+    K_min, K_max = _asymptotic_bracket(k, m, delta, M, k, M - m + k + 1, log_delta)
+    return _bracketed_hypergeometric_tail_inverse(k, m, delta, M, K_min, K_max, log_delta, backend)
+
+
+def _asymptotic_bracket(k, m, delta, M, K_min, K_max, log_delta=False):
+    """
+    Narrows the bracket (K_min, K_max] to the window of the normal approximation, certified with exact evaluations of the CDF.
+    """
+    window = _normal_approximation_window(k, m, delta, M, log_delta)
+    if window is None:
+        return K_min, K_max
+    K_lo, K_hi = window
+    return _certify_bracket(lambda K: _is_feasible(k, m, K, M, delta, log_delta), K_lo, K_hi, K_min, K_max)
+
+
+def _normal_approximation_inverse(k, m, z, M):
+    """
+    Solves for K the normal approximation of the CDF (k + 1/2 - mp)/σ = z, with p = K/M. Squaring gives a quadratic equation in p, of which the root on the side of k + 1/2 given by the sign of z is kept.
+    """
+    f = (M - m)/(M - 1)
+    x = k + .5
+    a = m*m + z*z*m*f
+    b = 2*m*x + z*z*m*f
+    c = x*x
+    sqrt_disc = math.sqrt(max(b*b - 4*a*c, 0))
+    p = (b + sqrt_disc)/(2*a) if z < 0 else (b - sqrt_disc)/(2*a)
+    return p*M
+
+
+def _normal_approximation_window(k, m, delta, M, log_delta=False):
+    """
+    Returns a window (K_lo, K_hi) expected to contain the pseudo-inverse according to the normal approximation and its error bound, or None if the approximation is not defined (delta = 0 or 1).
+    """
+    z = ndtri_exp(delta) if log_delta else ndtri(delta)
+    if not np.isfinite(z):
+        return None
+    K_hat = _normal_approximation_inverse(k, m, z, M)
+    p = min(max(K_hat/M, 1/M), 1 - 1/M)
+    error = 1/math.sqrt(m*p*(1-p)*(M-m)/(M-1))
+
+    delta = math.exp(delta) if log_delta else delta
+    if error < delta < 1 - error:
+        z_lo, z_hi = ndtri(delta - error), ndtri(delta + error)
+    else: # The error bound is meaningless in the tails, so we use a window of one standard deviation.
+        z_lo, z_hi = z - 1, z + 1
+    return math.floor(_normal_approximation_inverse(k, m, z_hi, M)), math.ceil(_normal_approximation_inverse(k, m, z_lo, M))
+
+
+def _certify_bracket(is_feasible, K_lo, K_hi, K_min, K_max):
+    """
+    Turns a window (K_lo, K_hi) guessed to contain the pseudo-inverse into a bracket (K_min, K_max] such that K_min is infeasible and K_max is feasible, starting from the known bracket (K_min, K_max]. The ends of the window are moved by doubling steps until they are certified.
+    """
+    K_lo = min(max(K_lo, K_min), K_max)
+    K_hi = min(max(K_hi, K_lo, K_min + 1), K_max) # K_min is known to be infeasible, so it cannot become K_max.
+    width = max(K_hi - K_lo, 1)
+    while K_hi < K_max and not is_feasible(K_hi):
+        K_min = K_hi
+        K_hi = min(K_hi + width, K_max)
+        width *= 2
+    K_max = K_hi
+
+    K_lo = max(K_lo, K_min)
+    while K_lo > K_min and is_feasible(K_lo):
+        K_max = K_lo
+        K_lo = max(K_lo - width, K_min)
+        width *= 2
+    return K_lo, K_max
+
+
+def _bisect(is_feasible, K_min, K_max):
+    """
+    Returns the smallest feasible K of the bracket (K_min, K_max], where K_min is known to be infeasible and K_max to be feasible.
+    """
+    while K_max - K_min > 1:
+        K_mid = (K_max + K_min + 1)//2
+        if is_feasible(K_mid):
+            K_max = K_mid
+        else:
+            K_min = K_mid
+    return K_max
+
+
+def batch_hypergeometric_tail_inverse(k, m, delta, M, log_delta=False, backend=None):
+    """
+    Vectorized version of 'hypergeometric_tail_inverse'. All parameters are broadcast together and the bisections are run simultaneously, so that each step requires a single vectorized call to the CDF for the whole batch instead of one call per element.
+
+    Args:
+        k (array of int): Number of errors observed.
+        m (array of int): Sample size.
+        delta (array of float): Confidence parameter threshold.
+        M (array of int): Population size.
+        log_delta (bool): Whether or not parameter 'delta' is the logarithm of delta to avoid overflow.
+        backend (str, 'auto', 'numba', 'python' or None): Backend used for the bisections. With numba, the elements are solved in parallel and only the ones stopped on a near tie are finished with scipy.
+
+    Returns an array of K, the number of errors in the whole population with probability 1 - delta. The decisions taken at each step are the same as in 'hypergeometric_tail_inverse', so that the results are identical.
+    """
+    k, m, delta, M = (np.array(x) for x in np.broadcast_arrays(k, m, delta, M))
+    K_min = k.copy()
+    K_max = M - m + k + 1
+    if jit.use_numba(backend) and all(np.issubdtype(x.dtype, np.integer) for x in (k, m, M)):
+        shape = K_max.shape
+        K_min, K_max = K_min.astype(np.int64).ravel(), K_max.astype(np.int64).ravel()
+        done = np.zeros(K_min.shape, dtype=bool)
+        jit.batch_tail_inverse_bisection(k.astype(np.int64).ravel(), m.astype(np.int64).ravel(), delta.astype(np.float64).ravel(), M.astype(np.int64).ravel(), log_delta, K_min, K_max, done)
+        if np.all(done):
+            return K_max.reshape(shape)
+        K_min, K_max = K_min.reshape(shape), K_max.reshape(shape)
+
+    return _batch_hypergeometric_tail_inverse_bisection(k, m, delta, M, K_min, K_max, log_delta)
+
+
+def _batch_hypergeometric_tail_inverse_bisection(k, m, delta, M, K_min, K_max, log_delta=False):
+    """
+    Vectorized bisection of 'batch_hypergeometric_tail_inverse' with scipy on the brackets (K_min, K_max].
+    """
+    if log_delta:
+        cdf_func = hypergeom.logcdf
+    else:
+        cdf_func = hypergeom.cdf
+
+    active = K_max - K_min > 1
+    while np.any(active):
+        K_mid = (K_max[active] + K_min[active] + 1)//2
+        d = delta[active]
+        hyp_cdf = cdf_func(k[active], M[active], K_mid, m[active])
+        go_up = (hyp_cdf > d) & ~close_to(hyp_cdf, d, atol=0, rtol=10e-16)
+        K_min[active] = np.where(go_up, K_mid, K_min[active])
+        K_max[active] = np.where(go_up, K_max[active], K_mid)
+        active = K_max - K_min > 1
+
+    return K_max
+
+
+def hypergeometric_tail_lower_inverse(k, m, one_minus_delta, M, log_delta=False):
     """
     Computes the lower pseudo-inverse of the hypergeometric distribution tail:
         HypLowerInv(k, m, delta, M) = max{ K : Hyp(k, m, K, M) >= delta },
@@ -181,6 +503,7 @@ def hypergeometric_tail_lower_inverse(k, m, one_minus_delta, M):
         m (int): Sample size.
         one_minus_delta (float): One minus the confidence parameter threshold.
         M (int): Population size.
+        log_delta (bool): Whether or not parameter 'one_minus_delta' is the logarithm of one minus delta to avoid underflow. In that case, the survival function is evaluated in logarithmic form as well.
 
     Implements a bisection algorithm to find the pseudo-inverse in O(k log(M-m)). The bisection is adjusted to deal with the discrete nature of the hypergeometric tail.
 
@@ -190,8 +513,8 @@ def hypergeometric_tail_lower_inverse(k, m, one_minus_delta, M):
     K_max = M - m + k + 1
     while K_max - K_min > 1:
         K_mid = (K_max + K_min + 1)//2
-        hyp_sf = hypergeometric_lower_tail(k, m, K_mid, M)
-        if close_to(hyp_sf, one_minus_delta, atol=0, rtol=10e-12):
+        hyp_sf, is_close = _lower_tail_comparison(k, m, K_mid, M, one_minus_delta, log_delta)
+        if is_close:
             return K_mid
         if hyp_sf > one_minus_delta:
             K_max = K_mid
@@ -201,6 +524,26 @@ def hypergeometric_tail_lower_inverse(k, m, one_minus_delta, M):
     return K_min
 
 
+def _lower_tail_comparison(k, m, K, M, one_minus_delta, log_delta=False):
+    """
+    Returns the survival function (or its logarithm) and whether it is close to one_minus_delta, with the tolerance of 'hypergeometric_tail_lower_inverse'.
+    """
+    if log_delta:
+        hyp_sf = log_hypergeometric_lower_tail(k, m, K, M)
+        # A relative tolerance on the survival function is an absolute tolerance on its logarithm.
+        return hyp_sf, close_to(hyp_sf, one_minus_delta, atol=10e-12, rtol=0)
+    hyp_sf = hypergeometric_lower_tail(k, m, K, M)
+    return hyp_sf, close_to(hyp_sf, one_minus_delta, atol=0, rtol=10e-12)
+
+
+def _is_above_lower_inverse(k, m, K, M, one_minus_delta, log_delta=False):
+    """
+    Returns True if K > HypLowerInv(k, m, delta, M), that is if the survival function at K is greater than one_minus_delta and not close to it. Since the survival function is increasing in K, the lower inverse is the last K for which this is False.
+    """
+    hyp_sf, is_close = _lower_tail_comparison(k, m, K, M, one_minus_delta, log_delta)
+    return hyp_sf > one_minus_delta and not is_close
+
+
 def berkopec_hypergeometric_tail_inverse(k, m, delta, M, start='below'):
     """
     Computes the pseudo-inverse of the hypergeometric distribution tail:
@@ -249,7 +592,7 @@ def berkopec_hypergeometric_tail_inverse(k, m, delta, M, start='below'):
         return K + 1
 
 
-def logberkopec_hypergeometric_tail_inverse(k, m, log_delta, M, start='below'):
+def logberkopec_hypergeometric_tail_inverse(k, m, log_delta, M, start='below', backend=None):
     """
     Computes the pseudo-inverse of the hypergeometric distribution tail for a logarithmic delta term and with a logarithmic algorithm to avoid under- and overflows and less memory usage.
 
@@ -259,25 +602,37 @@ def logberkopec_hypergeometric_tail_inverse(k, m, log_delta, M, start='below'):
         log_delta (negative float): Logarithm of the confidence parameter threshold.
         M (int): Population size.
         start (string, 'above' or 'below'): Specifies if the algorithm should approach log_delta from above or from below. Use 'above' if k << M - m and below otherwise.
+        backend (str, 'auto', 'numba', 'python' or None): Backend used for the loop. See the doc of 'hypergeo.jit' for more info.
 
     See the doc of the function 'hypergeometric_tail_inverse' for more info.
 
-    NOTE: This implementation is very fast, but it is prone to numerical errors. In particular, the 'above' approach is unstable for small deltas of order 10e-14 (i.e. very negative log_deltas) and will NOT yield the correct result. Such cases are handled easily and quite fast by using the 'below' approach. A good way to know if the result if correct is to check if both approaches agree together.
-
     This algorithm is the same as in 'hypergeometric_tail_inverse', but in logarithmic form to limit memory usage and to increase efficiency using optimized algorithms to compute the binomial coefficients. We use the identity
         log(a + b) = log(a) + log(1 + b/a) = log(a) + log(1 + exp(log(b) - log(a)))
     to compute only the change to the logarithmic CDF at each step, with the fac that log(a) is the quantity to update and log(b) is quick to compute.
 
+    NOTE: The 'above' approach substracts terms from the whole sum, which suffers from cancellation once the CDF is much smaller than its initial value of 1: the absolute error of the running sum stays of the order of the machine epsilon, so its relative error grows like 1/delta. The approach is therefore only used for log_delta >= log(10e-9), where the error is small enough for the returned K to be moved to the exact answer in a few steps by checking it against the directly computed CDF. Smaller deltas are handled with the 'below' approach, which is accurate and fast in this regime. Compensated (Kahan or Neumaier) summation is deliberately not used here: the error comes from the cancellation between the terms and the running CDF, whose values are themselves rounded (to a few ulps for the logarithms of the binomial coefficients), so compensating the additions slows down the loop without making the result exact, whereas the 'below' approach never subtracts and keeps a relative error of a few ulps. The result of the 'below' approach is checked against the directly computed CDF as well, so that both approaches and both backends (whose logarithms of the binomial coefficients differ by a few ulps) agree for the whole range of deltas.
+
     Returns K the number of errors in the whole population with probability 1 - delta.
     """
-    log_delta += binomln(M, m)
+    if start == 'above' and log_delta < _MIN_ABOVE_LOG_DELTA:
+        start = 'below'
+
+    if start in ('above', 'below') and jit.use_numba(backend) and _is_integral(k, m, M):
+        K = jit.logberkopec_tail_inverse(int(k), int(m), float(log_delta), int(M), start == 'above')
+        return _refine_logberkopec_inverse(k, m, log_delta, M, K)
+
+    log_norm_factor = binomln(M, m)
+    log_delta += log_norm_factor
     if start == 'above':
         K = k
-        log_hyp_cdf = math.log(comb(M, m, exact=True))
-        while log_hyp_cdf > log_delta and not close_to(log_hyp_cdf, log_delta, atol=0, rtol=10e-16) and K <= M-m+k:
-            log_hyp_cdf += np.log1p(-np.exp(binomln(K, k) + binomln(M-K-1, M-K-m+k) - log_hyp_cdf))
+        log_hyp_cdf = log_norm_factor
+        while K <= M-m+k and not close_to_or_less_than(log_hyp_cdf, log_delta, atol=0, rtol=10e-16):
+            log_ratio = binomln(K, k) + binomln(M-K-1, M-K-m+k) - log_hyp_cdf
             K += 1
-        return K
+            if log_ratio >= 0:
+                break # The term removes what is left of the CDF up to rounding errors.
+            log_hyp_cdf += np.log1p(-np.exp(log_ratio))
+        return _refine_logberkopec_inverse(k, m, log_delta - log_norm_factor, M, K)
 
     elif start == 'below':
         K = M - m + k
@@ -285,7 +640,166 @@ def logberkopec_hypergeometric_tail_inverse(k, m, log_delta, M, start='below'):
         while close_to_or_less_than(log_hyp_cdf, log_delta, atol=0, rtol=10e-16) and K >= k:
             K -= 1
             log_hyp_cdf += np.log1p(np.exp(binomln(K, k) + binomln(M-K-1, M-K-m+k) - log_hyp_cdf))
-        return K + 1
+        return _refine_logberkopec_inverse(k, m, log_delta - log_norm_factor, M, K + 1)
+
+
+def blocked_logberkopec_hypergeometric_tail_inverse(k, m, log_delta, M, block_size=1024, max_block_size=2**20):
+    """
+    Computes the pseudo-inverse of the hypergeometric distribution tail with Berkopec's formula in logarithmic form, processing the terms by blocks with numpy instead of one at a time.
+
+    Args:
+        k (int): Number of errors observed.
+        m (int): Sample size.
+        log_delta (negative float): Logarithm of the confidence parameter threshold.
+        M (int): Population size.
+        block_size (int): Number of terms of the first block. The size is doubled after each block, so that answers close to M - m + k are found quickly while long sums use large blocks.
+        max_block_size (int): Maximum number of terms per block, which bounds the memory usage.
+
+    The terms of Berkopec's formula are summed from K = M - m + k downward, as in the 'below' approach of 'logberkopec_hypergeometric_tail_inverse'. For each block, the logarithms of the terms are computed at once with 'gammaln', the partial sums with a cumulative log-sum-exp, and the crossing of log_delta with 'searchsorted' on the (nondecreasing) partial sums. The crossing is finally checked against the directly computed CDF, as in the 'above' approach of 'logberkopec_hypergeometric_tail_inverse'.
+
+    Returns K the number of errors in the whole population with probability 1 - delta.
+    """
+    if k >= m: # The CDF is 1 for every K.
+        return k if close_to_or_less_than(0., log_delta, atol=0, rtol=10e-16) else M - m + k + 1
+
+    threshold = log_delta + binomln(M, m)
+    threshold += 10e-16*abs(threshold) # Largest partial sum considered close to or less than delta
+    log_sum = -np.inf
+    K = M - m + k
+    while K >= k:
+        Js = np.arange(K, max(K - block_size, k - 1), -1)
+        # Note that binom(M-J-1, M-J-m+k) = binom(M-J-1, m-k-1).
+        log_terms = binomln(Js, k) + binomln(M-Js-1, m-k-1)
+        log_sums = np.logaddexp.accumulate(np.concatenate(([log_sum], log_terms)))[1:]
+        i = np.searchsorted(log_sums, threshold, side='right')
+        if i < len(Js):
+            return _refine_logberkopec_inverse(k, m, log_delta, M, int(Js[i]) + 1)
+        log_sum = log_sums[-1]
+        K = int(Js[-1]) - 1
+        block_size = min(2*block_size, max_block_size)
+    return _refine_logberkopec_inverse(k, m, log_delta, M, k)
+
+
+# Smallest logarithm of delta for which the 'above' approach of 'logberkopec_hypergeometric_tail_inverse' is used. Below, the cancellation in the running sum makes the approach slower than 'below'.
+_MIN_ABOVE_LOG_DELTA = math.log(10e-9)
+
+
+def _refine_logberkopec_inverse(k, m, log_delta, M, K):
+    """
+    Moves K to the smallest feasible value according to the directly computed logarithmic CDF, starting from an approximate solution.
+    """
+    log_norm_factor = binomln(M, m)
+    log_delta += log_norm_factor
+    def is_feasible(K):
+        if K > M-m+k:
+            return True
+        return close_to_or_less_than(log_hypergeometric_tail(k, m, K, M) + log_norm_factor, log_delta, atol=0, rtol=10e-16)
+
+    while K > k and is_feasible(K-1):
+        K -= 1
+    while not is_feasible(K):
+        K += 1
+    return K
+
+
+class BerkopecSolver:
+    """
+    Computes the pseudo-inverse of the hypergeometric distribution tail for many (k, delta) queries with the same sample size m and population size M, using Berkopec's formula with the 'below' approach.
+
+    The normalization binom(M, m) is computed once, and the partial sum of Berkopec's formula reached by the last query on each k is kept. A new query with the same k advances the sum from there (adding terms downward or removing them upward) instead of restarting from K = M - m + k. Sweeps over delta for a fixed k are thus in O(distance between consecutive answers) instead of O(M - m) each.
+
+    The results are the same as those of 'berkopec_hypergeometric_tail_inverse' (or 'logberkopec_hypergeometric_tail_inverse' if log=True) with start='below'.
+    """
+    def __init__(self, m, M, log=False):
+        """
+        Args:
+            m (int): Sample size.
+            M (int): Population size.
+            log (bool): If True, uses the logarithmic algorithm and the queries take the logarithm of delta. Otherwise, exact integer arithmetic is used.
+        """
+        self.m = m
+        self.M = M
+        self.log = log
+        if log:
+            self.log_norm_factor = binomln(M, m)
+        else:
+            self.norm_factor = comb(M, m, exact=True)
+        self._states = {}
+
+    def tail_inverse(self, k, delta):
+        """
+        Computes HypInv(k, m, delta, M).
+
+        Args:
+            k (int): Number of errors observed.
+            delta (float): Confidence parameter threshold, or its logarithm if the solver was created with log=True.
+
+        Returns K the number of errors in the whole population with probability 1 - delta.
+        """
+        if k >= self.m: # The CDF is 1 for every K.
+            is_feasible = close_to_or_less_than(0. if self.log else 1., delta, atol=0, rtol=10e-16)
+            return k if is_feasible else self.M - self.m + k + 1
+        if self.log:
+            return self._log_tail_inverse(k, delta)
+        return self._exact_tail_inverse(k, delta)
+
+    def _exact_tail_inverse(self, k, delta):
+        """
+        The state of each k is (K, S, term), where term is the unnormalized Berkopec term of K and S is the unnormalized sum of the terms from K to M - m + k.
+        """
+        m, M = self.m, self.M
+        K_top = M - m + k
+        if k not in self._states:
+            term = berkopec_unnormalized_single_term(k, m, K_top, M)
+            self._states[k] = (K_top, term, term)
+        K, S, term = self._states[k]
+        is_feasible = lambda S: close_to_or_less_than(S/self.norm_factor, delta, atol=0, rtol=10e-16)
+
+        if is_feasible(S):
+            while K > k:
+                previous_term = term*(K-k)*(M-K) // (K*(M-K+1-m+k))
+                if not is_feasible(S + previous_term):
+                    break
+                K -= 1
+                term = previous_term
+                S += term
+            K_inv = K
+        else:
+            while K < K_top and not is_feasible(S):
+                S -= term
+                K += 1
+                term *= K*(M-K+1-m+k)
+                term //= (K-k)*(M-K)
+            K_inv = K if is_feasible(S) else K_top + 1
+
+        self._states[k] = (K, S, term)
+        return K_inv
+
+    def _log_tail_inverse(self, k, log_delta):
+        """
+        The state of each k is the list of the logarithms of the unnormalized partial sums, from K = M - m + k downward, computed with the same arithmetic as 'logberkopec_hypergeometric_tail_inverse'. Since the partial sums increase, the answer is found by binary search on the list, which is extended only when needed. It is then checked against the directly computed CDF, as in 'logberkopec_hypergeometric_tail_inverse'.
+        """
+        m, M = self.m, self.M
+        K_top = M - m + k
+        if k not in self._states:
+            self._states[k] = [binomln(K_top, k) + binomln(m-k-1, 0)]
+        log_sums = self._states[k]
+        log_delta += self.log_norm_factor
+        is_feasible = lambda log_sum: close_to_or_less_than(log_sum, log_delta, atol=0, rtol=10e-16)
+
+        while is_feasible(log_sums[-1]) and K_top - len(log_sums) >= k - 1:
+            K = K_top - len(log_sums)
+            log_sums.append(log_sums[-1] + np.log1p(np.exp(binomln(K, k) + binomln(M-K-1, M-K-m+k) - log_sums[-1])))
+
+        # First index of an infeasible partial sum, or the length of the list if all are feasible.
+        low, high = 0, len(log_sums)
+        while low < high:
+            mid = (low + high)//2
+            if is_feasible(log_sums[mid]):
+                low = mid + 1
+            else:
+                high = mid
+        return _refine_logberkopec_inverse(k, m, log_delta - self.log_norm_factor, M, K_top - low + 1)
 
 
 def naive_hypergeometric_tail_inverse(k, m, delta, M, start='below'):
@@ -0,0 +1,110 @@
+import numpy as np
+import json
+import os
+import struct
+
+from hypergeo.hypergeometric_distribution import hypergeometric_tail_inverse_profile
+from version import __version__
+
+
+class InverseTable:
+    """
+    Precomputed table of the hypergeometric tail inverse HypInv(k, m, delta, M) for every k in 0..m and a fixed set of deltas, for a given sample size m and population size M.
+
+    The table is a single file made of:
+        - the magic bytes b'HYPINV', followed by the length of the header as a little-endian uint32;
+        - a JSON header with m, M, the deltas, whether they are logarithms, the dtype of the table and the version of the package;
+        - padding to a multiple of 64 bytes, followed by the table of shape (len(deltas), m+1) in C order.
+
+    The table is stored with the smallest unsigned integer type able to hold M+1 and read through a memory map, so that each lookup is an array read and the pages are shared by all processes using the same file.
+
+    Use 'InverseTable.build' to compute a table and 'InverseTable(path)' to open an existing one.
+    """
+    MAGIC = b'HYPINV'
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Path of the table file.
+        """
+        self.path = path
+        self.header, offset = self._read_header(path)
+        self.m = self.header['m']
+        self.M = self.header['M']
+        self.deltas = self.header['deltas']
+        self.log_delta = self.header['log_delta']
+        self.version = self.header['version']
+        self._delta_index = {delta: i for i, delta in enumerate(self.deltas)}
+        self.table = np.memmap(path, dtype=self.header['dtype'], mode='r', offset=offset, shape=(len(self.deltas), self.m+1))
+
+    @classmethod
+    def _read_header(cls, path):
+        with open(path, 'rb') as file:
+            if file.read(len(cls.MAGIC)) != cls.MAGIC:
+                raise ValueError(f"'{path}' is not a table of hypergeometric tail inverses.")
+            header_length, = struct.unpack('<I', file.read(4))
+            header = json.loads(file.read(header_length).decode())
+        return header, cls._data_offset(header_length)
+
+    @classmethod
+    def _data_offset(cls, header_length):
+        return -(-(len(cls.MAGIC) + 4 + header_length) // 64) * 64
+
+    @classmethod
+    def build(cls, path, m, M, deltas, log_delta=False):
+        """
+        Computes the table and writes it to 'path'. If a table built with the same arguments and the same version of the package already exists at 'path', it is opened instead.
+
+        Each row is computed in a single sweep over k with 'hypergeometric_tail_inverse_profile'.
+
+        Args:
+            path (str): Path of the table file.
+            m (int): Sample size.
+            M (int): Population size.
+            deltas (list of float): Confidence parameter thresholds for which the inverses are computed.
+            log_delta (bool): Whether or not the deltas are logarithms of delta.
+
+        Returns the opened table.
+        """
+        header = {
+            'm': int(m),
+            'M': int(M),
+            'deltas': [float(delta) for delta in deltas],
+            'log_delta': bool(log_delta),
+            'dtype': np.min_scalar_type(M+1).str,
+            'version': __version__,
+        }
+        if os.path.exists(path):
+            if cls._read_header(path)[0] != header:
+                raise ValueError(f"The table at '{path}' was built with different parameters or another version of the package.")
+            return cls(path)
+
+        table = np.empty((len(deltas), m+1), dtype=header['dtype'])
+        for i, delta in enumerate(header['deltas']):
+            table[i] = hypergeometric_tail_inverse_profile(m, delta, M, log_delta)
+
+        encoded_header = json.dumps(header).encode()
+        # The table is written to a temporary file then moved, so that other processes never open a partial table.
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'wb') as file:
+            file.write(cls.MAGIC + struct.pack('<I', len(encoded_header)) + encoded_header)
+            file.write(b'\0' * (cls._data_offset(len(encoded_header)) - file.tell()))
+            file.write(table.tobytes())
+        os.replace(tmp_path, path)
+        return cls(path)
+
+    def lookup(self, k, delta):
+        """
+        Returns HypInv(k, m, delta, M) from the table.
+
+        Args:
+            k (int or array of int): Number of errors observed, between 0 and m.
+            delta (float): Confidence parameter threshold (or its logarithm if the table was built with log_delta=True). Must be one of the deltas of the table.
+        """
+        try:
+            i = self._delta_index[float(delta)]
+        except KeyError:
+            raise KeyError(f'delta={delta} is not in the table. Available deltas are {self.deltas}.') from None
+        K = self.table[i, k]
+        # Converted to signed integers so that expressions such as K-1-k cannot wrap around.
+        return int(K) if np.ndim(K) == 0 else K.astype(np.int64)
@@ -0,0 +1,209 @@
+"""
+Optional compiled backend for the hypergeometric tail inverses.
+
+If numba is importable, the kernels of this module are compiled in nopython mode. Otherwise, they are plain Python functions and the 'python' backend (scipy based) is used by default, so that numba is never required.
+
+The backend can be chosen globally with 'set_backend' or per call with the 'backend' argument of the inverse functions. Possible values are:
+    - 'auto' (default): uses numba if it is importable, else python;
+    - 'numba': uses numba and raises an ImportError if it is not installed;
+    - 'python': uses the scipy implementation.
+
+The compiled bisection evaluates the CDF with its own log-space summation, together with a bound on its numerical error. Whenever a comparison to delta falls within that error bound (or within the tolerance used by the scipy implementation), the kernel stops and returns its current bracket, which is then refined with scipy. The discrete results are therefore identical to the ones of the python backend.
+"""
+import math
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+NUMBA_AVAILABLE = numba is not None
+BACKENDS = ('auto', 'numba', 'python')
+
+_backend = 'auto'
+
+
+def set_backend(backend):
+    """
+    Sets the default backend of the inverse functions. See the module docstring for the possible values.
+    """
+    global _backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}'. Possible values are {BACKENDS}.")
+    if backend == 'numba' and not NUMBA_AVAILABLE:
+        raise ImportError("The 'numba' backend requires the package numba.")
+    _backend = backend
+
+
+def get_backend():
+    return _backend
+
+
+def use_numba(backend=None):
+    """
+    Returns True if the compiled kernels should be used for the given backend (or the default one if None).
+    """
+    backend = backend or _backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}'. Possible values are {BACKENDS}.")
+    if backend == 'numba' and not NUMBA_AVAILABLE:
+        raise ImportError("The 'numba' backend requires the package numba.")
+    return backend == 'numba' or (backend == 'auto' and NUMBA_AVAILABLE)
+
+
+if NUMBA_AVAILABLE:
+    def _njit(parallel=False):
+        return numba.njit(cache=True, nogil=True, parallel=parallel)
+    prange = numba.prange
+else:
+    def _njit(parallel=False):
+        return lambda func: func
+    prange = range
+
+
+_EPS = np.finfo(np.float64).eps
+# Below this value of log(delta), scipy's CDF may underflow, so the comparisons are left to scipy.
+_MIN_LOG_DELTA = -690.
+
+
+@_njit()
+def log_binomial(n, k):
+    """
+    Logarithm of the binomial coefficient.
+    """
+    return math.lgamma(n+1) - math.lgamma(k+1) - math.lgamma(n-k+1)
+
+
+@_njit()
+def log_hypergeometric_pmf(k, m, K, M):
+    """
+    Logarithm of the hypergeometric probability mass function.
+    """
+    return log_binomial(K, k) + log_binomial(M-K, m-k) - log_binomial(M, m)
+
+
+@_njit()
+def log_hypergeometric_tail(k, m, K, M):
+    """
+    Logarithm of the hypergeometric distribution tail, computed by summing the probability mass function from j = k downward with the ratio of consecutive terms.
+
+    Returns the logarithm of the CDF and a bound on its absolute numerical error.
+    """
+    j_min = max(0, m - M + K)
+    if k < j_min:
+        return -np.inf, 0.
+    if k >= min(m, K):
+        return 0., 0.
+
+    lgammas = (math.lgamma(K+1), math.lgamma(k+1), math.lgamma(K-k+1),
+               math.lgamma(M-K+1), math.lgamma(m-k+1), math.lgamma(M-K-m+k+1),
+               math.lgamma(M+1), math.lgamma(m+1), math.lgamma(M-m+1))
+    log_term = (lgammas[0] - lgammas[1] - lgammas[2]
+                + lgammas[3] - lgammas[4] - lgammas[5]
+                - lgammas[6] + lgammas[7] + lgammas[8])
+    error = 0.
+    for value in lgammas:
+        error += abs(value)
+    error *= 4*_EPS
+
+    # The sum is taken relative to the first term and rescaled if it grows too large.
+    term, total = 1., 1.
+    n_steps = 0
+    for j in range(k, j_min, -1):
+        ratio = float(j)*(M-K-m+j) / (float(K-j+1)*(m-j+1))
+        term *= ratio
+        total += term
+        n_steps += 1
+        if ratio < 1 and term*ratio/(1-ratio) < total*_EPS/4:
+            break # The remaining terms decrease geometrically and are negligible.
+        if total > 1e250:
+            log_term += math.log(total)
+            term /= total
+            total = 1.
+
+    return log_term + math.log(total), error + 8*_EPS*(n_steps+1)
+
+
+@_njit()
+def tail_feasibility(k, m, K, M, delta, log_delta):
+    """
+    Compares Hyp(k, m, K, M) to delta (or its logarithm if log_delta is True).
+
+    Returns 1 if the CDF is less than or equal to delta, 0 if it is greater, and -1 if the comparison is too close to be decided reliably, in which case the scipy implementation should be used.
+    """
+    if log_delta:
+        log_d = delta
+    elif delta > 0:
+        log_d = math.log(delta)
+    else:
+        return -1
+    if not log_delta and log_d < _MIN_LOG_DELTA:
+        return -1
+
+    log_cdf, error = log_hypergeometric_tail(k, m, K, M)
+    # In linear scale, the scipy implementation uses a relative tolerance on delta, which is an absolute tolerance on log(delta).
+    tolerance = 4*error + 1e-12*max(1., abs(log_d))
+    if abs(log_cdf - log_d) <= tolerance:
+        return -1
+    return 0 if log_cdf > log_d else 1
+
+
+@_njit()
+def tail_inverse_bisection(k, m, delta, M, log_delta, K_min, K_max):
+    """
+    Bisection of 'hypergeometric_tail_inverse' on the bracket (K_min, K_max].
+
+    Returns the bracket and a boolean which is False if the bisection stopped early because a comparison to delta was too close to be decided reliably. In that case, the bracket should be refined with the scipy implementation.
+    """
+    while K_max - K_min > 1:
+        K_mid = (K_max + K_min + 1)//2
+        feasibility = tail_feasibility(k, m, K_mid, M, delta, log_delta)
+        if feasibility < 0:
+            return K_min, K_max, False
+        if feasibility:
+            K_max = K_mid
+        else:
+            K_min = K_mid
+    return K_min, K_max, True
+
+
+@_njit(parallel=True)
+def batch_tail_inverse_bisection(k, m, delta, M, log_delta, K_min, K_max, done):
+    """
+    Parallel version of 'tail_inverse_bisection' over arrays. The brackets and the 'done' flags are updated in place.
+    """
+    for i in prange(len(k)):
+        K_min[i], K_max[i], done[i] = tail_inverse_bisection(k[i], m[i], delta[i], M[i], log_delta, K_min[i], K_max[i])
+
+
+@_njit()
+def _close_to(a, b):
+    return abs(a - b) <= 10e-16*abs(b)
+
+
+@_njit()
+def logberkopec_tail_inverse(k, m, log_delta, M, above):
+    """
+    Compiled version of the loops of 'logberkopec_hypergeometric_tail_inverse', using the same recurrences. The logarithms of the binomial coefficients are computed with 'math.lgamma' instead of scipy's 'gammaln', so the result may differ by one from the python backend when the CDF is within a few ulps of delta. The result should thus be checked with '_refine_logberkopec_inverse', which removes this difference.
+    """
+    log_norm_factor = log_binomial(M, m)
+    log_delta += log_norm_factor
+    if above:
+        K = k
+        log_hyp_cdf = log_norm_factor
+        while K <= M-m+k and log_hyp_cdf > log_delta and not _close_to(log_hyp_cdf, log_delta):
+            log_ratio = log_binomial(K, k) + log_binomial(M-K-1, M-K-m+k) - log_hyp_cdf
+            K += 1
+            if log_ratio >= 0:
+                break
+            log_hyp_cdf += math.log1p(-math.exp(log_ratio))
+        return K
+    else:
+        K = M - m + k
+        log_hyp_cdf = log_binomial(K, k) + log_binomial(M-K-1, M-K-m+k)
+        while (log_hyp_cdf <= log_delta or _close_to(log_hyp_cdf, log_delta)) and K >= k:
+            K -= 1
+            log_hyp_cdf += math.log1p(math.exp(log_binomial(K, k) + log_binomial(M-K-1, M-K-m+k) - log_hyp_cdf))
+        return K + 1
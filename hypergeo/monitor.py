@@ -0,0 +1,126 @@
+import numpy as np
+
+from hypergeo.hypergeometric_distribution import hypergeometric_tail_inverse, _is_feasible, _certify_bracket, _bracketed_hypergeometric_tail_inverse
+from hypergeo.generalization_bounds import optimize_mprime
+
+
+class HypinvMonitor:
+    """
+    Keeps the bound of Theorem 5 (see 'hypinv_upperbound') up to date while the number of errors k and the number of examples m of a classifier grow one observation at a time.
+
+    The optimal ghost sample size mprime only moves slightly from one observation to the next. Instead of optimizing it from scratch, each update runs a pattern search starting from the last optimum: the bound is evaluated at mprime ± 1, 2, 4, ... around the current center, which moves to the best value found until it is the best of its neighbors. The steps of increasing size allow the search to cross the small plateaus of the bound, which is a staircase in mprime. Moreover, the hypergeometric tail inverse also moves by a few units at most, so the last inverse found for each mprime is used as a guess, certified with two evaluations of the CDF, instead of bisecting over the whole range. With numba installed, these evaluations use the compiled kernel of 'hypergeo.jit'.
+
+    The result is a local optimum of the bound over mprime, which is in practice very close to the global one found by 'optimize_mprime'. Call 'reset' to optimize mprime from scratch.
+    """
+    def __init__(self, growth_function, delta=0.05, k=0, m=0, log_delta=False, max_mprime=None, max_iterations=100):
+        """
+        Args:
+            growth_function (callable): Growth function of the hypothesis class. Will receive m+mprime as input and should output a number (or its logarithm if log_delta is True).
+            delta (float): Confidence parameter (or its logarithm if log_delta is True).
+            k (int): Initial number of errors.
+            m (int): Initial number of examples.
+            log_delta (bool): If True, it is assumed parameter 'delta' and 'growth_function' are respectively the logarithm of delta and of the growth function (to avoid overflow).
+            max_mprime (int or None): Maximum value of mprime of the initial optimization. If None, defaults to 15*m.
+            max_iterations (int): Maximum number of moves of the pattern search at each update.
+        """
+        self.growth_function = growth_function
+        self.delta = delta
+        self.k = k
+        self.m = m
+        self.log_delta = log_delta
+        self.max_mprime = max_mprime
+        self.max_iterations = max_iterations
+        self.mprime = None
+        self.bound = 1
+        self._inverses = {} # Last tail inverse found for each mprime, used as guesses.
+        if m > 0:
+            self._optimize()
+
+    def update(self, error):
+        """
+        Adds one observation and updates the bound.
+
+        Args:
+            error (bool): Whether or not the classifier made an error on the new example.
+
+        Returns the updated bound.
+        """
+        return self.add(int(error), 1)
+
+    def add(self, n_errors, n_examples):
+        """
+        Adds a batch of observations and updates the bound.
+
+        Args:
+            n_errors (int): Number of errors of the classifier on the new examples.
+            n_examples (int): Number of new examples.
+
+        Returns the updated bound.
+        """
+        self.k += n_errors
+        self.m += n_examples
+        if self.mprime is None:
+            self._optimize()
+        else:
+            self._local_search()
+        return self.bound
+
+    def reset(self):
+        """
+        Optimizes mprime from scratch with 'optimize_mprime'.
+
+        Returns the updated bound.
+        """
+        self._inverses = {}
+        self._optimize()
+        return self.bound
+
+    def _optimize(self):
+        max_mprime = self.max_mprime if self.max_mprime is not None else 15*self.m
+        self.mprime, self.bound = optimize_mprime(self.k, self.m, self.growth_function, self.delta, max_mprime=max_mprime, return_bound=True, log_delta=self.log_delta)
+
+    def _local_search(self):
+        if self.k == self.m:
+            self.bound = 1
+            return
+
+        evaluated = {}
+        center = self.mprime
+        for _ in range(self.max_iterations):
+            step = 1
+            while step == 1 or step <= center//4:
+                for mprime in (center - step, center + step):
+                    if mprime >= 1 and mprime not in evaluated:
+                        evaluated[mprime] = self._bound(mprime)
+                step *= 2
+            if center not in evaluated:
+                evaluated[center] = self._bound(center)
+            # Ties are broken in favor of the largest mprime, as in 'optimize_mprime'.
+            best_mprime = min(evaluated, key=lambda mprime: (evaluated[mprime], -mprime))
+            if best_mprime == center:
+                break
+            center = best_mprime
+
+        self.mprime, self.bound = center, evaluated[center]
+        self._inverses = {mprime: self._inverses[mprime] for mprime in evaluated}
+
+    def _bound(self, mprime):
+        """
+        Computes the same value as 'hypinv_upperbound' for the given mprime, starting the search of the tail inverse from its last value.
+        """
+        k, m, M = self.k, self.m, self.m + mprime
+        if self.log_delta:
+            delta = self.delta - np.log(4) - self.growth_function(M)
+        else:
+            delta = self.delta/4/self.growth_function(M)
+
+        K_min, K_max = k, M - m + k + 1
+        if mprime in self._inverses:
+            K = self._inverses[mprime]
+            is_feasible = lambda K: _is_feasible(k, m, K, M, delta, self.log_delta)
+            K_min, K_max = _certify_bracket(is_feasible, K-1, K, K_min, K_max)
+            K = _bracketed_hypergeometric_tail_inverse(k, m, delta, M, K_min, K_max, self.log_delta)
+        else:
+            K = hypergeometric_tail_inverse(k, m, delta, M, self.log_delta)
+        self._inverses[mprime] = K
+        return max(1, K-1-k)/mprime
@@ -0,0 +1,384 @@
+"""
+Local HTTP server computing bounds on demand.
+
+The server exposes the bounds and the raw hypergeometric tail inverses as JSON endpoints. Start it with
+
+    python -m hypergeo.server --mode=serve --port=8421
+
+and send requests such as
+
+    POST /hypinv_upperbound {"k": 5, "m": 100, "d": 10, "delta": 0.05, "mprime": 400}
+
+Bounds that require a growth function receive the VC dimension 'd' instead, and Sauer-Shelah's lemma is used. Concurrent requests received within a few milliseconds are grouped into a micro-batch and answered with a single vectorized inversion when possible. Results are kept in an in-process LRU cache.
+
+A load-test client is provided with '--mode=load_test'.
+"""
+import asyncio
+import json
+import time
+from collections import OrderedDict, defaultdict
+import numpy as np
+
+from hypergeo.hypergeometric_distribution import hypergeometric_tail_inverse, batch_hypergeometric_tail_inverse, hypergeometric_tail_lower_inverse
+from hypergeo.generalization_bounds import hypinv_upperbound, batch_hypinv_upperbound, hypinv_reldev_upperbound, sample_compression_bound
+from hypergeo.utils import sauer_shelah, log_sauer_shelah, func_to_cmd
+
+
+def _with_growth_function(bound):
+    def bound_from_d(d, **kwargs):
+        growth_function = log_sauer_shelah(d) if kwargs.get('log_delta') else sauer_shelah(d)
+        return bound(growth_function=growth_function, **kwargs)
+    return bound_from_d
+
+
+FUNCTIONS = {
+    'hypinv_upperbound': _with_growth_function(hypinv_upperbound),
+    'hypinv_reldev_upperbound': _with_growth_function(hypinv_reldev_upperbound),
+    'sample_compression_bound': sample_compression_bound,
+    'hypergeometric_tail_inverse': hypergeometric_tail_inverse,
+    'hypergeometric_tail_lower_inverse': hypergeometric_tail_lower_inverse,
+}
+
+
+def _batch_inverse(requests, log_delta):
+    k, m, delta, M = ([r[key] for r in requests] for key in ('k', 'm', 'delta', 'M'))
+    return batch_hypergeometric_tail_inverse(k, m, delta, M, log_delta).tolist()
+
+
+def _batch_upperbound(requests, log_delta):
+    k, m, d, delta, mprime = ([r[key] for r in requests] for key in ('k', 'm', 'd', 'delta', 'mprime'))
+    growth_function = log_sauer_shelah(np.array(d)) if log_delta else sauer_shelah(np.array(d))
+    return batch_hypinv_upperbound(k, m, growth_function, delta, mprime, log_delta).tolist()
+
+
+# Vectorized implementations, with the exact set of keyword arguments they support (besides 'log_delta').
+VECTORIZED = {
+    'hypergeometric_tail_inverse': ({'k', 'm', 'delta', 'M'}, _batch_inverse),
+    'hypinv_upperbound': ({'k', 'm', 'd', 'delta', 'mprime'}, _batch_upperbound),
+}
+
+
+def _evaluate_one(name, kwargs):
+    try:
+        return FUNCTIONS[name](**kwargs), None
+    except Exception as e:
+        return None, f'{type(e).__name__}: {e}'
+
+
+def evaluate_batch(requests):
+    """
+    Evaluates a batch of requests, using a single vectorized call for each group of requests that support it.
+
+    Args:
+        requests (list of tuples (name, kwargs)): Name of the function and its keyword arguments.
+
+    Returns a list of tuples (result, error) in the same order as the requests, where error is None on success.
+    """
+    results = [None]*len(requests)
+    groups = defaultdict(list)
+    for i, (name, kwargs) in enumerate(requests):
+        if name in VECTORIZED and set(kwargs) - {'log_delta'} == VECTORIZED[name][0]:
+            groups[name, bool(kwargs.get('log_delta', False))].append(i)
+        else:
+            results[i] = _evaluate_one(name, kwargs)
+
+    for (name, log_delta), idx in groups.items():
+        try:
+            values = VECTORIZED[name][1]([requests[i][1] for i in idx], log_delta)
+            for i, value in zip(idx, values):
+                results[i] = (value, None)
+        except Exception:
+            # Isolates the faulty requests
+            for i in idx:
+                results[i] = _evaluate_one(*requests[i])
+
+    return results
+
+
+class BoundServer:
+    """
+    Asyncio server answering bound requests by micro-batches.
+
+    Requests are accumulated for 'batch_window' seconds (or until 'max_batch_size' requests are pending), deduplicated, looked up in an LRU cache, and the remaining ones are evaluated together with 'evaluate_batch' in a worker thread so that the event loop keeps accepting requests.
+    """
+    def __init__(self, batch_window=0.002, max_batch_size=4096, cache_size=100_000):
+        """
+        Args:
+            batch_window (float): Time in seconds during which requests are accumulated before being evaluated.
+            max_batch_size (int): Number of pending requests which triggers an evaluation before the end of the window.
+            cache_size (int): Maximum number of results kept in the LRU cache.
+        """
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.pending = {}
+        self.flush_handle = None
+        self.n_batches = 0
+
+    async def submit(self, name, kwargs):
+        """
+        Submits a request and waits for its result. Raises a ValueError if the evaluation failed.
+        """
+        if name not in FUNCTIONS:
+            raise ValueError(f"Unknown function '{name}'. Available functions are {list(FUNCTIONS)}.")
+        try:
+            key = (name, tuple(sorted(kwargs.items())))
+            hash(key)
+        except TypeError:
+            raise ValueError('Parameters must be scalars.')
+
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            result, error = self.cache[key]
+        else:
+            if key not in self.pending:
+                self.pending[key] = asyncio.get_running_loop().create_future()
+                if len(self.pending) >= self.max_batch_size:
+                    self._flush()
+                elif self.flush_handle is None:
+                    self.flush_handle = asyncio.get_running_loop().call_later(self.batch_window, self._flush)
+            result, error = await asyncio.shield(self.pending[key])
+
+        if error is not None:
+            raise ValueError(error)
+        return result
+
+    def _flush(self):
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        pending, self.pending = self.pending, {}
+        if pending:
+            asyncio.get_running_loop().create_task(self._evaluate(pending))
+
+    async def _evaluate(self, pending):
+        self.n_batches += 1
+        keys = list(pending)
+        requests = [(name, dict(items)) for name, items in keys]
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(None, evaluate_batch, requests)
+        except Exception as e:
+            results = [(None, f'{type(e).__name__}: {e}')]*len(keys)
+
+        for key, result in zip(keys, results):
+            self.cache[key] = result
+            self.cache.move_to_end(key)
+            pending[key].set_result(result)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await _read_http_message(reader)
+                    if request is None:
+                        break
+                    start_line, headers, body = request
+                    method, target = _parse_start_line(start_line)
+                except ValueError as e:
+                    # The next requests cannot be delimited reliably after a malformed one, so the connection is closed.
+                    writer.write(_http_message('HTTP/1.1 400 Bad Request', json.dumps({'error': str(e)}).encode(), {'Connection': 'close'}))
+                    await writer.drain()
+                    break
+                name = target.strip('/')
+                status, response = '200 OK', None
+                if method == 'GET' and name == '':
+                    response = {'functions': list(FUNCTIONS)}
+                elif method != 'POST':
+                    status, response = '405 Method Not Allowed', {'error': 'Use POST /<function_name> with a JSON body.'}
+                else:
+                    try:
+                        kwargs = json.loads(body or b'{}')
+                        if not isinstance(kwargs, dict):
+                            raise ValueError('The body must be a JSON object of keyword arguments.')
+                        response = {'result': await self.submit(name, kwargs)}
+                    except ValueError as e:
+                        status, response = '400 Bad Request', {'error': str(e)}
+
+                writer.write(_http_message(f'HTTP/1.1 {status}', json.dumps(response, default=_json_default).encode()))
+                await writer.drain()
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8421, unix_socket=None):
+        """
+        Serves requests forever on the given TCP address, or on the given Unix socket if provided.
+        """
+        if unix_socket:
+            server = await asyncio.start_unix_server(self.handle_connection, path=unix_socket)
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+def _json_default(obj):
+    if hasattr(obj, 'tolist'): # Numpy arrays and scalars
+        return obj.tolist()
+    return str(obj)
+
+
+def _http_message(start_line, body, headers=None):
+    headers = {'Content-Type': 'application/json', 'Content-Length': len(body), **(headers or {})}
+    head = start_line + '\r\n' + ''.join(f'{key}: {value}\r\n' for key, value in headers.items()) + '\r\n'
+    return head.encode() + body
+
+
+def _parse_start_line(start_line):
+    """
+    Returns the method and the target of the start line of a request. Raises a ValueError if it is malformed.
+    """
+    parts = start_line.split(' ')
+    if len(parts) != 3 or not parts[2].startswith('HTTP/'):
+        raise ValueError(f"Malformed request line '{start_line}'.")
+    return parts[0], parts[1]
+
+
+async def _read_http_message(reader):
+    """
+    Reads an HTTP message with a body delimited by its Content-Length. Returns None if the connection was closed. Raises a ValueError if the message cannot be decoded.
+    """
+    start_line = await reader.readline()
+    if not start_line:
+        return None
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        key, _, value = line.decode().partition(':')
+        headers[key.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers.get('content-length', 0)))
+    return start_line.decode().strip(), headers, body
+
+
+class BoundClient:
+    """
+    Minimal client of the bound server keeping a single connection alive.
+    """
+    def __init__(self, host='127.0.0.1', port=8421, unix_socket=None):
+        self.host, self.port, self.unix_socket = host, port, unix_socket
+        self.reader = self.writer = None
+
+    async def connect(self):
+        if self.unix_socket:
+            self.reader, self.writer = await asyncio.open_unix_connection(self.unix_socket)
+        else:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def call(self, name, **kwargs):
+        """
+        Calls a function of the server and returns its result. Raises a ValueError if the server answered with an error.
+        """
+        if self.writer is None:
+            await self.connect()
+        headers = {'Host': self.host}
+        self.writer.write(_http_message(f'POST /{name} HTTP/1.1', json.dumps(kwargs).encode(), headers))
+        await self.writer.drain()
+        _, _, body = await _read_http_message(self.reader)
+        response = json.loads(body)
+        if 'error' in response:
+            raise ValueError(response['error'])
+        return response['result']
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            await self.writer.wait_closed()
+            self.reader = self.writer = None
+
+
+async def load_test(host='127.0.0.1', port=8421, unix_socket=None, n_requests=10_000, concurrency=64, n_distinct=1000, seed=42):
+    """
+    Sends random 'hypinv_upperbound' requests to a running server from 'concurrency' concurrent connections.
+
+    Args:
+        host (str): Address of the server.
+        port (int): Port of the server.
+        unix_socket (str or None): Path of the Unix socket of the server. If given, host and port are ignored.
+        n_requests (int): Total number of requests to send.
+        concurrency (int): Number of concurrent connections.
+        n_distinct (int): Number of distinct requests to sample from. Lower values exercise the cache more.
+        seed (int): Seed of the random requests.
+
+    Returns a dictionary with the throughput and latency percentiles.
+    """
+    rng = np.random.default_rng(seed)
+    ms = rng.integers(50, 2000, size=n_distinct)
+    distinct_requests = [
+        {'k': int(rng.integers(0, m//4 + 1)), 'm': int(m), 'd': int(rng.integers(1, 20)), 'delta': 0.05, 'mprime': int(4*m)}
+        for m in ms
+    ]
+    requests = [distinct_requests[i] for i in rng.integers(0, n_distinct, size=n_requests)]
+    latencies = []
+    errors = 0
+
+    async def worker(worker_requests):
+        nonlocal errors
+        client = BoundClient(host, port, unix_socket)
+        await client.connect()
+        for kwargs in worker_requests:
+            start = time.perf_counter()
+            try:
+                await client.call('hypinv_upperbound', **kwargs)
+            except ValueError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+        await client.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(requests[i::concurrency]) for i in range(concurrency)))
+    duration = time.perf_counter() - start
+
+    latencies = np.array(latencies)*1000
+    return {
+        'requests': n_requests,
+        'errors': errors,
+        'duration (s)': duration,
+        'throughput (req/s)': n_requests/duration,
+        'latency p50 (ms)': float(np.percentile(latencies, 50)),
+        'latency p99 (ms)': float(np.percentile(latencies, 99)),
+    }
+
+
+@func_to_cmd
+def main(mode='serve',
+         host='127.0.0.1',
+         port=8421,
+         unix_socket='',
+         batch_window=0.002,
+         cache_size=100_000,
+         n_requests=10_000,
+         concurrency=64):
+    """
+    Runs the bound server or the load-test client.
+
+    Args:
+        mode (str, 'serve' or 'load_test'): Whether to start the server or to send requests to a running server.
+        host (str): Address of the server.
+        port (int): Port of the server.
+        unix_socket (str): Path of a Unix socket to use instead of TCP.
+        batch_window (float): Time in seconds during which requests are accumulated into a micro-batch.
+        cache_size (int): Maximum number of results kept in the LRU cache.
+        n_requests (int): Number of requests sent by the load test.
+        concurrency (int): Number of concurrent connections of the load test.
+    """
+    if mode == 'serve':
+        server = BoundServer(batch_window=batch_window, cache_size=cache_size)
+        asyncio.run(server.serve(host, port, unix_socket or None))
+    elif mode == 'load_test':
+        results = asyncio.run(load_test(host, port, unix_socket or None, n_requests, concurrency))
+        for key, value in results.items():
+            print(f'{key}: {value:.4g}')
+    else:
+        raise ValueError(f"Unknown mode '{mode}'. Use 'serve' or 'load_test'.")
+
+
+if __name__ == '__main__':
+    main()
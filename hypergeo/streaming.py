@@ -0,0 +1,50 @@
+from itertools import islice
+
+from hypergeo.hypergeometric_distribution import batch_hypergeometric_tail_inverse
+from hypergeo.generalization_bounds import batch_hypinv_upperbound
+
+
+def _batched(iterable, batch_size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def stream_hypergeometric_tail_inverse(params, batch_size=4096, log_delta=False):
+    """
+    Computes the pseudo-inverse of the hypergeometric distribution tail for a stream of parameters.
+
+    The parameters are consumed lazily and grouped into batches which are inverted at once with 'batch_hypergeometric_tail_inverse'. At most one batch is held in memory, so that the function can be used in a pipeline between a reader and a writer.
+
+    Args:
+        params (iterable of tuples (k, m, delta, M)): Parameters of each inversion (see 'hypergeometric_tail_inverse').
+        batch_size (int): Number of inversions computed at once.
+        log_delta (bool): Whether or not the deltas are logarithms to avoid overflow.
+
+    Yields K for each tuple of parameters, in the same order.
+    """
+    for batch in _batched(params, batch_size):
+        k, m, delta, M = zip(*batch)
+        yield from batch_hypergeometric_tail_inverse(k, m, delta, M, log_delta).tolist()
+
+
+def stream_hypinv_upperbound(params, growth_function, batch_size=4096, log_delta=False):
+    """
+    Computes the bound of Theorem 5 for a stream of parameters.
+
+    The parameters are consumed lazily and grouped into batches which are evaluated at once with 'batch_hypinv_upperbound'. At most one batch is held in memory, so that the function can be used in a pipeline between a reader and a writer.
+
+    Args:
+        params (iterable of tuples (k, m, delta, mprime)): Parameters of each bound (see 'hypinv_upperbound').
+        growth_function (callable): Growth function of the hypothesis class. Will receive an array of m+mprime as input and should output an array.
+        batch_size (int): Number of bounds computed at once.
+        log_delta (bool): If True, it is assumed the deltas and 'growth_function' are respectively the logarithm of delta and of the growth function (to avoid overflow).
+
+    Yields epsilon for each tuple of parameters, in the same order.
+    """
+    for batch in _batched(params, batch_size):
+        k, m, delta, mprime = zip(*batch)
+        yield from batch_hypinv_upperbound(k, m, growth_function, delta, mprime, log_delta).tolist()
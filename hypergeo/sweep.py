@@ -0,0 +1,121 @@
+import numpy as np
+import xarray as xr
+from itertools import product
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from hypergeo.generalization_bounds import hypinv_upperbound
+from hypergeo.utils import sauer_shelah
+from hypergeo.curve_store import CurveStore
+
+
+def compute_bound_curve(k, m, d, delta, max_mprime, bound=hypinv_upperbound):
+    """
+    Computes the bound for every ghost sample size mprime between 1 and 'max_mprime'.
+
+    Args:
+        k (int): Number of errors of the classifier on the sample.
+        m (int): Number of examples of the sample.
+        d (int): VC dimension of the hypothesis class. The growth function is bounded using Sauer-Shelah's lemma.
+        delta (float): Confidence parameter.
+        max_mprime (int): Largest ghost sample size to evaluate.
+        bound (callable): Bound to evaluate. Must have the signature of 'hypinv_upperbound'.
+
+    Returns a numpy array of length 'max_mprime' whose i-th entry is the bound for mprime = i+1.
+    """
+    growth_function = sauer_shelah(d)
+    bounds = np.ones(max_mprime)
+    for mprime in range(1, max_mprime+1):
+        bounds[mprime-1] = bound(k, m, growth_function, delta, mprime)
+    return bounds
+
+
+def _compute_shard(shard):
+    idx, (k, m, d, delta, max_mprime, bound) = shard
+    return idx, compute_bound_curve(k, m, d, delta, max_mprime, bound)
+
+
+def mprime_tradeoff_sweep(ms,
+                          risks,
+                          ds,
+                          deltas,
+                          max_mprime=10_000,
+                          path=None,
+                          bound=hypinv_upperbound,
+                          n_workers=None,
+                          verbose=False):
+    """
+    Computes the bound as a function of the ghost sample size mprime for every configuration of the grid product(ms, risks, ds, deltas), and reduces each curve to its optimal value.
+
+    Each configuration is a shard computed by a pool of processes. Shards are scheduled from the largest to the smallest sample size m, so that the most expensive ones do not end up running alone at the end of the sweep. If 'path' is provided, every curve is checkpointed as soon as it is completed in a single CurveStore (one row per configuration, with parameters m, risk, k, d and delta), and calling the function again with the same parameters resumes the sweep where it stopped.
+
+    Args:
+        ms (list of int): Sample sizes.
+        risks (list of float): Empirical risks. The number of errors is k = int(m*risk).
+        ds (list of int): VC dimensions.
+        deltas (list of float): Confidence parameters.
+        max_mprime (int): Largest ghost sample size to evaluate for each configuration.
+        path (str or None): Directory of the checkpoint store. If None, nothing is saved to disk.
+        bound (callable): Bound to evaluate. Must have the signature of 'hypinv_upperbound' and be picklable.
+        n_workers (int or None): Number of processes. If None, defaults to the number of CPUs. If 1, the sweep runs in the current process.
+        verbose (bool): If True, prints the progress of the sweep.
+
+    Returns an xarray.Dataset with dimensions (m, risk, d, delta) and variables 'bound' (best bound), 'mprime' (best mprime) and 'bound_at_mprime=m'.
+    """
+    coords = {'m': ms, 'risk': risks, 'd': ds, 'delta': deltas}
+    shape = tuple(len(values) for values in coords.values())
+
+    grid = list(product(*(range(n) for n in shape)))
+    params = [{'m': ms[i], 'risk': risks[j], 'k': int(ms[i]*risks[j]), 'd': ds[l], 'delta': deltas[n]} for i, j, l, n in grid]
+
+    if path is not None:
+        store = CurveStore.create(path, params, max_mprime, metadata={'bound': bound.__name__})
+        done = store.done.reshape(shape)
+    else:
+        store = None
+        done = np.zeros(shape, dtype=bool)
+
+    best_mprimes = np.zeros(shape)
+    best_bounds = np.zeros(shape)
+    bounds_at_mprime_equals_m = np.zeros(shape)
+
+    def reduce(idx, curve):
+        m = ms[idx[0]]
+        min_idx = np.argmin(curve)
+        best_mprimes[idx] = min_idx + 1
+        best_bounds[idx] = curve[min_idx]
+        bounds_at_mprime_equals_m[idx] = curve[m-1] if m <= max_mprime else np.nan
+
+    shards = []
+    for idx, p in zip(grid, params):
+        if done[idx]:
+            reduce(idx, store.curves[np.ravel_multi_index(idx, shape)])
+            continue
+        shards.append((idx, (p['k'], p['m'], p['d'], p['delta'], max_mprime, bound)))
+    shards.sort(key=lambda shard: -shard[1][1])
+    n_completed = [done.size - len(shards)]
+
+    def checkpoint(idx, curve):
+        if store is not None:
+            store.write(np.ravel_multi_index(idx, shape), curve)
+        reduce(idx, curve)
+        if verbose:
+            n_completed[0] += 1
+            print(f'Completed shards: {n_completed[0]}/{done.size}', end='\r')
+
+    if n_workers == 1:
+        for shard in shards:
+            checkpoint(*_compute_shard(shard))
+    elif shards:
+        with ProcessPoolExecutor(n_workers) as executor:
+            futures = [executor.submit(_compute_shard, shard) for shard in shards]
+            for future in as_completed(futures):
+                checkpoint(*future.result())
+
+    return xr.Dataset(
+        data_vars={
+            'bound': (['m', 'risk', 'd', 'delta'], best_bounds),
+            'bound_at_mprime=m': (['m', 'risk', 'd', 'delta'], bounds_at_mprime_equals_m),
+            'mprime': (['m', 'risk', 'd', 'delta'], best_mprimes)
+        },
+        coords=coords
+    )
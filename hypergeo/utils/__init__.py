@@ -1,2 +1,3 @@
 from hypergeo.utils.utils import *
 from hypergeo.utils.func_to_cmd import func_to_cmd
+from hypergeo.utils.curve_cache import cached_curve, cached_bound_curve
@@ -0,0 +1,137 @@
+import numpy as np
+import functools
+import hashlib
+import inspect
+import os
+import sysconfig
+import types
+
+from version import __version__
+
+
+_PACKAGE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+_LIBRARY_PATHS = tuple({os.path.abspath(sysconfig.get_path(name)) + os.sep for name in ('stdlib', 'platstdlib', 'purelib', 'platlib')})
+
+
+def cached_curve(directory):
+    """
+    Decorator caching on disk the arrays returned by a function computing the data of a figure, so that rebuilding a figure whose data did not change only reruns LaTeX.
+
+    The key of a call is a hash of:
+        - the code of the decorated function;
+        - its arguments, where arrays are hashed by content and functions (such as the lambdas of the bounds) by their code, their closure and the global variables they use;
+        - the version of the package hypergeo and the source code of the modules of the package defining the functions used.
+    Modifying the bounds, their parameters or the function computing the curve thus invalidates the cached curves, but changing the style of the figure or an unrelated module of the package does not. Since only the modules of the functions found in the arguments are hashed, modifying a module they depend on indirectly (for example the hypergeometric distribution used by 'hypinv_upperbound') requires changing the version of the package or clearing the cache.
+
+    Args:
+        directory (str): Directory of the cache. The result of each call is saved to '<directory>/<name of the function>/<key>.npy'.
+
+    Example:
+        @cached_curve(path+'/data')
+        def bound_curve(bound, *params):
+            return np.array([bound(*p) for p in zip(*params)])
+
+        bound_values = bound_curve(lambda k, m: hypinv_upperbound(k, m, sauer_shelah(d), delta), ks, ms)
+
+    Returns the decorator.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = curve_key(func, *args, **kwargs)
+            file = os.path.join(directory, func.__name__, key + '.npy')
+            if os.path.exists(file):
+                return np.load(file)
+
+            curve = np.asarray(func(*args, **kwargs))
+            os.makedirs(os.path.dirname(file), exist_ok=True)
+            # The curve is written to a temporary file then moved, so that an interrupted run never leaves a partial curve.
+            tmp_file = os.path.join(directory, func.__name__, key + '.tmp.npy')
+            np.save(tmp_file, curve)
+            os.replace(tmp_file, file)
+            return curve
+        return wrapper
+    return decorator
+
+
+def cached_bound_curve(directory):
+    """
+    Returns the function 'bound_curve(bound, *params)' shared by the scripts of the figures, which evaluates 'bound' on the values of 'params' taken in parallel and caches the curve in 'directory' with 'cached_curve'.
+
+    Example:
+        bound_curve = cached_bound_curve(path+'/data')
+        bound_values = bound_curve(lambda k, m: hypinv_upperbound(k, m, sauer_shelah(d), delta), ks, ms)
+    """
+    @cached_curve(directory)
+    def bound_curve(bound, *params):
+        return np.array([bound(*p) for p in zip(*params)])
+    return bound_curve
+
+
+def curve_key(func, *args, **kwargs):
+    """
+    Returns the key used by 'cached_curve' for the call func(*args, **kwargs).
+    """
+    fingerprint = (__version__, _fingerprint(func), _fingerprint(args), _fingerprint(kwargs))
+    return hashlib.sha256(repr(fingerprint).encode()).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _source_fingerprint(filename):
+    with open(filename, 'rb') as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def _fingerprint(value, seen=frozenset()):
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes, np.generic)):
+        return (type(value).__name__, repr(value))
+    if isinstance(value, np.ndarray):
+        return ('ndarray', value.dtype.str, value.shape, hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest())
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(_fingerprint(item, seen) for item in value))
+    if isinstance(value, dict):
+        return ('dict', tuple(sorted((repr(key), _fingerprint(item, seen)) for key, item in value.items())))
+    if isinstance(value, functools.partial):
+        return ('partial', _fingerprint(value.func, seen), _fingerprint(value.args, seen), _fingerprint(value.keywords, seen))
+    if isinstance(value, types.ModuleType):
+        return ('module', value.__name__)
+    if inspect.isfunction(value):
+        return _function_fingerprint(value, seen)
+    if callable(value): # Builtins, ufuncs and classes
+        return ('callable', getattr(value, '__module__', None), getattr(value, '__qualname__', getattr(value, '__name__', None)))
+    raise TypeError(f'Cannot compute a cache key for an object of type {type(value).__name__}.')
+
+
+def _function_fingerprint(func, seen):
+    """
+    Functions are identified by their name, closure and default values. Functions of the package hypergeo are also identified by the source code of their module. The code and the global variables used are added for functions defined outside of the package and of the installed libraries.
+    """
+    fingerprint = ('function', func.__module__, func.__qualname__)
+    if func in seen: # Recursive function
+        return fingerprint
+    seen = seen | {func}
+
+    closure = tuple(_fingerprint(cell.cell_contents, seen) for cell in func.__closure__ or ())
+    fingerprint += (closure, _fingerprint(func.__defaults__, seen), _fingerprint(func.__kwdefaults__, seen))
+
+    filename = os.path.abspath(func.__code__.co_filename)
+    if filename.startswith(_PACKAGE_PATH):
+        fingerprint += (_source_fingerprint(filename),)
+    elif not filename.startswith(_LIBRARY_PATHS):
+        global_names = sorted(name for name in _global_names(func.__code__) if name in func.__globals__)
+        global_values = tuple((name, _fingerprint(func.__globals__[name], seen)) for name in global_names)
+        fingerprint += (_code_fingerprint(func.__code__), global_values)
+    return fingerprint
+
+
+def _global_names(code):
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names |= _global_names(const)
+    return names
+
+
+def _code_fingerprint(code):
+    consts = tuple(_code_fingerprint(const) if inspect.iscode(const) else repr(const) for const in code.co_consts)
+    return (code.co_code, consts, code.co_names)
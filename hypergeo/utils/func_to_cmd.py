@@ -1,11 +1,19 @@
 import functools
 import argparse
 import inspect
+import importlib
+import json
+import csv
+import sys
+from collections import deque
+from multiprocessing import Pool
 
 
 def func_to_cmd(func):
     """
     Quick way to make any function with optional keyword arguments parsable from the command line.
+
+    The generated command line also has a batch mode to evaluate the function many times in a single process. Use '--batch=<path>' (or '--batch=-' for stdin) to read JSON lines or CSV rows of keyword arguments. Results are streamed to stdout in the same format and order. See 'run_batch' for more info.
     """
     @functools.wraps(func)
     def parser(**kwargs):
@@ -19,6 +27,7 @@ def func_to_cmd(func):
         if func.__doc__:
             parser.format_help = help_formatter(func)
         
+        value_types = {}
         for key, value in signature_kwargs.items():
             value_type = type(value)
             if isinstance(value, bool):
@@ -29,13 +38,132 @@ def func_to_cmd(func):
                 else:
                     list_type = str
                 value_type = list_parse(list_type)
+            # Parameters without a typed default (e.g. None) are read from CSV files as raw strings.
+            value_types[key] = value_type if value is not None else str
             parser.add_argument(f'--{key}', dest=key, default=value, type=value_type)
+        parser.add_argument('--batch', dest='_batch', default=None, type=str)
+        parser.add_argument('--batch_format', dest='_batch_format', default=None, choices=['jsonl', 'csv'])
+        parser.add_argument('--batch_workers', dest='_batch_workers', default=1, type=int)
         kwargs = vars(parser.parse_args())
+        batch, batch_format, batch_workers = kwargs.pop('_batch'), kwargs.pop('_batch_format'), kwargs.pop('_batch_workers')
+        if batch is not None:
+            return run_batch(func, batch, batch_format, batch_workers, defaults=kwargs, value_types=value_types)
         # Returns the original func with new kwargs
         return func(**kwargs)
     return parser
 
 
+def run_batch(func, batch, batch_format=None, n_workers=1, defaults=None, value_types=None, output=None):
+    """
+    Evaluates a function on every row of keyword arguments of a file and streams the results.
+
+    Each row is either a JSON object (one per line) or a CSV row with a header. The keyword arguments of the row override the default ones. The output has the same format as the input, with the columns of each row followed by a 'result' and an 'error' column. If the evaluation of a row raises an exception, its message is written in the 'error' column and the batch continues.
+
+    Args:
+        func (callable): Function to evaluate. If n_workers > 1, it must be importable from its module under its qualified name (possibly decorated by 'func_to_cmd').
+        batch (str): Path of the input file, or '-' to read from stdin.
+        batch_format (str, 'jsonl', 'csv' or None): Format of the input. If None, inferred from the file extension and defaults to 'jsonl'.
+        n_workers (int): Number of processes. If 1, the rows are evaluated in the current process.
+        defaults (dict or None): Default keyword arguments.
+        value_types (dict or None): Types used to convert the CSV values of each keyword argument (which are read as strings).
+        output (file or None): Where to write the results. Defaults to stdout.
+    """
+    defaults = defaults or {}
+    value_types = value_types or {}
+    output = output or sys.stdout
+    if batch_format is None:
+        batch_format = 'csv' if batch.endswith('.csv') else 'jsonl'
+
+    file = sys.stdin if batch == '-' else open(batch, 'r', newline='')
+    try:
+        fieldnames = None
+        if batch_format == 'csv':
+            reader = csv.DictReader(file)
+            fieldnames = reader.fieldnames or []
+            records = (_read_csv_row(row, value_types) for row in reader)
+        else:
+            records = (_read_json_row(line) for line in file if line.strip())
+
+        # Rows waiting for their result. Results are produced in the same order as the tasks.
+        pending = deque()
+        def tasks():
+            for row, row_kwargs, error in records:
+                pending.append((row, error))
+                yield None if error is not None else {**defaults, **row_kwargs}
+
+        if n_workers == 1:
+            results = (_evaluate_row(func, kwargs) for kwargs in tasks())
+            _write_results(results, pending, batch_format, fieldnames, output)
+        else:
+            with Pool(n_workers, initializer=_init_worker, initargs=(func.__module__, func.__qualname__)) as pool:
+                results = pool.imap(_evaluate_row_in_worker, tasks())
+                _write_results(results, pending, batch_format, fieldnames, output)
+    finally:
+        if file is not sys.stdin:
+            file.close()
+
+
+def _read_csv_row(row, value_types):
+    try:
+        row_kwargs = {key: value_types.get(key, str)(value) for key, value in row.items() if value != ''}
+        return row, row_kwargs, None
+    except Exception as e:
+        return row, None, f'{type(e).__name__}: {e}'
+
+
+def _read_json_row(line):
+    try:
+        row = json.loads(line)
+        if not isinstance(row, dict):
+            raise ValueError('Expected a JSON object of keyword arguments.')
+        return row, row, None
+    except Exception as e:
+        return {}, None, f'{type(e).__name__}: {e}'
+
+
+def _evaluate_row(func, kwargs):
+    if kwargs is None:
+        return None, None
+    try:
+        return func(**kwargs), None
+    except Exception as e:
+        return None, f'{type(e).__name__}: {e}'
+
+
+_worker_func = None
+
+def _init_worker(module, qualname):
+    global _worker_func
+    func = importlib.import_module(module)
+    for name in qualname.split('.'):
+        func = getattr(func, name)
+    _worker_func = inspect.unwrap(func)
+
+
+def _evaluate_row_in_worker(kwargs):
+    return _evaluate_row(_worker_func, kwargs)
+
+
+def _json_default(obj):
+    if hasattr(obj, 'tolist'): # Numpy arrays and scalars
+        return obj.tolist()
+    return str(obj)
+
+
+def _write_results(results, pending, batch_format, fieldnames, output):
+    if batch_format == 'csv':
+        writer = csv.DictWriter(output, fieldnames=fieldnames + ['result', 'error'], extrasaction='ignore')
+        writer.writeheader()
+    for result, error in results:
+        row, read_error = pending.popleft()
+        error = read_error or error
+        if batch_format == 'csv':
+            writer.writerow({**row, 'result': '' if result is None else result, 'error': error or ''})
+        else:
+            output.write(json.dumps({**row, 'result': result, 'error': error}, default=_json_default) + '\n')
+        output.flush()
+
+
 def bool_parse(arg):
     if arg.lower() in ('true', 't', 'yes', 'y', '1'):
         return True
@@ -65,6 +193,12 @@ In the case of lists, use the syntax
 
 \t--<list_variable_name>=[<value1>,<value2>,...]
 
+To evaluate the function on many sets of parameters in a single process, use
+
+\t--batch=<path_to_jsonl_or_csv_file> (or --batch=- to read from stdin)
+
+optionally with --batch_format=<jsonl|csv> and --batch_workers=<number_of_processes>.
+
 Docstring of function '{func.__name__}':
 """ + func.__doc__)
     return format_help
\ No newline at end of file
@@ -1,4 +1,7 @@
 import numpy as np
+import functools
+import math
+from scipy.special import logsumexp
 
 
 def close_to(a, b, atol=0, rtol=10e-16):
@@ -14,3 +17,117 @@ def sauer_shelah(d):
 
 def log_sauer_shelah(d):
     return lambda m: d*np.log(np.e*m/d)
+
+
+@functools.lru_cache(maxsize=None)
+def exact_log_sauer_shelah(d):
+    """
+    Logarithm of the exact Sauer-Shelah bound on the growth function of a class of VC dimension d, which is Σ_{i≤d} C(M, i). It is tighter than the closed form of 'log_sauer_shelah'.
+
+    The growth function is cached per d and can be evaluated on a number or on an array of M. Consecutive values of M (such as the ones of 'optimize_mprime') are computed incrementally in O(d) each. See '_ExactLogSauerShelah' for details.
+
+    Returns the growth function.
+    """
+    return _ExactLogSauerShelah(d)
+
+
+def exact_sauer_shelah(d):
+    """
+    Exact Sauer-Shelah bound on the growth function (see 'exact_log_sauer_shelah').
+    """
+    log_growth_function = exact_log_sauer_shelah(d)
+    return lambda m: np.exp(log_growth_function(m))
+
+
+class _ExactLogSauerShelah:
+    """
+    Computes log Φ(M), where Φ(M) = Σ_{i≤d} C(M, i).
+
+    Φ(M) = 2^M for M <= d. For M >= 2d, the terms are increasing in i, so Φ(M) = C(M, d) Σ_{i≤d} w_i with the ratios w_i = C(M, i)/C(M, d) <= 1. Going from M to M+1 multiplies the ratios by (M+1-d)/(M+1-i) and C(M, d) by (M+1)/(M+1-d), so the next value is computed in O(d) without any logarithm or special function, and the relative errors only add up from one step to the next. To keep the result independent of the order of the calls, the ratios are computed exactly with a log-sum-exp at the anchors M = 2d + i*ANCHOR_INTERVAL, and the recurrence is always applied from the anchor below M. The last state is kept, so that a sweep over consecutive values of M (as in 'optimize_mprime') costs a single update per step. The values are also memoized.
+    """
+    ANCHOR_INTERVAL = 64
+    MAX_CACHE_SIZE = 2**16
+
+    def __init__(self, d):
+        self.d = d
+        self._i = np.arange(d + 1)
+        self._last = None # (M, log Φ(M), log C(M, d), ratios w)
+        self._values = {}
+
+    def __call__(self, M):
+        if np.ndim(M) == 0:
+            return self._scalar(M)
+        return self._array(np.asarray(M))
+
+    def _scalar(self, M):
+        if M != int(M): # Φ is only computed incrementally on integers.
+            return M*math.log(2) if M <= self.d else self._exact(np.array([M], dtype=float))[0][0]
+        M = int(M) # Floats with integral values, such as the ones of the 'ratio' search of 'optimize_mprime'
+        if M in self._values:
+            return self._values[M]
+        if M <= self.d:
+            return M*math.log(2)
+        if M < 2*self.d:
+            return self._exact(np.array([M], dtype=float))[0][0]
+
+        n_steps = (M - 2*self.d) % self.ANCHOR_INTERVAL
+        last = self._last
+        if last is not None and last[0] == M - 1 and n_steps > 0:
+            log_phi, log_c, w = self._step(M - 1, last[2], last[3])
+        else:
+            anchor = M - n_steps
+            log_phi, log_c, w = self._exact(np.array([anchor], dtype=float))
+            log_phi, log_c, w = log_phi[0], log_c[0], w[0]
+            for N in range(anchor, M):
+                log_phi, log_c, w = self._step(N, log_c, w)
+
+        self._last = (M, log_phi, log_c, w)
+        if len(self._values) >= self.MAX_CACHE_SIZE:
+            self._values.clear()
+        self._values[M] = log_phi
+        return log_phi
+
+    def _step(self, M, log_c, w):
+        """
+        Returns log Φ(M+1), log C(M+1, d) and the ratios w from log C(M, d) and the ratios of M.
+        """
+        w = w * ((M + 1 - self.d)/(M + 1 - self._i))
+        log_c = log_c + math.log((M + 1)/(M + 1 - self.d))
+        return log_c + math.log(w.sum()), log_c, w
+
+    def _exact(self, M):
+        """
+        Returns log Φ(M), log C(M, d) and the ratios w for an array of M >= d, computed with log C(M, i) = Σ_{j≤i} log((M-j+1)/j). The ratios are only meaningful for M >= 2d.
+        """
+        j = self._i[1:]
+        log_terms = np.log(M[:, None] - j + 1) - np.log(j)
+        log_comb = np.concatenate((np.zeros((len(M), 1)), np.cumsum(log_terms, axis=1)), axis=1)
+        log_c = log_comb[:, -1]
+        w = np.exp(np.minimum(log_comb - log_c[:, None], 0))
+        return logsumexp(log_comb, axis=1), log_c, w
+
+    def _array(self, M):
+        """
+        Vectorized version of '_scalar', applying the recurrence simultaneously from the anchors of all M.
+        """
+        M_flat = M.astype(float).ravel()
+        log_phi = M_flat*np.log(2)
+
+        medium = (M_flat > self.d) & (M_flat < 2*self.d)
+        if np.any(medium):
+            log_phi[medium] = self._exact(M_flat[medium])[0]
+
+        large = M_flat >= 2*self.d
+        if np.any(large):
+            n_steps = (M_flat[large] - 2*self.d) % self.ANCHOR_INTERVAL
+            N = M_flat[large] - n_steps
+            log_phi_large, log_c, w = self._exact(N)
+            for step in range(int(n_steps.max(initial=0))):
+                active = step < n_steps
+                N_active = N[active]
+                w[active] *= (N_active[:, None] + 1 - self.d)/(N_active[:, None] + 1 - self._i)
+                log_c[active] += np.log((N_active + 1)/(N_active + 1 - self.d))
+                log_phi_large[active] = log_c[active] + np.log(w[active].sum(axis=1))
+                N[active] += 1
+            log_phi[large] = log_phi_large
+        return log_phi.reshape(M.shape)
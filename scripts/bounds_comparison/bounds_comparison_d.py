@@ -3,13 +3,16 @@ import numpy as np
 import python2latex as p2l
 from graal_utils import Timer
 
-from hypergeo import hypinv_upperbound, vapnik_pessismistic_bound, vapnik_relative_deviation_bound, catoni_4_6
-from hypergeo.utils import sauer_shelah
+from hypergeo import optimize_mprime, hypinv_upperbound, vapnik_pessismistic_bound, vapnik_relative_deviation_bound, catoni_4_6
+from hypergeo.utils import sauer_shelah, cached_bound_curve
 
 import os
 path = os.path.dirname(__file__)
 
 
+bound_curve = cached_bound_curve(path+'/data')
+
+
 def plot_comp_d(risk, m, delta=0.05):
     ds = np.array(
         list(range(1, 20, 1))
@@ -52,26 +55,16 @@ def plot_comp_d(risk, m, delta=0.05):
 
     # Catoni
     with Timer('C4.6'):
-        bound_values = np.array([catoni_4_6(k, m, d, delta, mprime=None) for d in ds])
+        bound_values = bound_curve(lambda d: catoni_4_6(k, m, d, delta, mprime=None), ds)
         print(ds[np.argmin((bound_values - .5)**2)])
         plot.add_plot(ds, bound_values, legend='C4.6')
 
     # HTI
     with Timer('HTI'):
         def mprime(d):
-            best_mp = int(3.25*m)
-            best_bound = 1
-            for ratio in np.arange(3.25, 13, step=.25):
-                mp = int(m*ratio)
-                bound = hypinv_upperbound(k, m, sauer_shelah(d), delta, mp)
-                if bound < best_bound:
-                    best_bound = bound
-                    best_mp = mp
-                elif bound > best_bound:
-                    break
-            return best_mp
-
-        bound_values = np.array([hypinv_upperbound(k, m, sauer_shelah(d), delta, mprime=mprime(d)) for d in ds])
+            return optimize_mprime(k, m, sauer_shelah(d), delta, search='ratio', ratio_range=(3.25, 13))
+
+        bound_values = bound_curve(lambda d: hypinv_upperbound(k, m, sauer_shelah(d), delta, mprime=mprime(d)), ds)
         print(ds[np.argmin((bound_values - .5)**2)])
         plot.add_plot(ds, bound_values, legend='HTI')
 
@@ -3,13 +3,16 @@ import numpy as np
 import python2latex as p2l
 from graal_utils import Timer
 
-from hypergeo import hypinv_upperbound, vapnik_pessismistic_bound, vapnik_relative_deviation_bound, catoni_4_6, lugosi_chaining
-from hypergeo.utils import sauer_shelah
+from hypergeo import optimize_mprime, hypinv_upperbound, vapnik_pessismistic_bound, vapnik_relative_deviation_bound, catoni_4_6, lugosi_chaining
+from hypergeo.utils import sauer_shelah, cached_bound_curve
 
 import os
 path = os.path.dirname(__file__)
 
 
+bound_curve = cached_bound_curve(path+'/data')
+
+
 def plot_comp_m(risk, d, delta=0.05):
     ms = np.array(
         list(range(d, 100, 2))
@@ -43,7 +46,7 @@ def plot_comp_m(risk, d, delta=0.05):
 
     # Lugosi
     with Timer('Lugosi'):
-        bound_values = np.array([lugosi_chaining(k, m, d, delta) for k, m in zip(ks, ms)])
+        bound_values = bound_curve(lambda k, m: lugosi_chaining(k, m, d, delta), ks, ms)
         print(ms[np.argmin((bound_values - .5)**2)])
         plot.add_plot(ms, bound_values - risk, legend='Lugosi', color=p2l.holi(200)[-1])
 
@@ -61,26 +64,16 @@ def plot_comp_m(risk, d, delta=0.05):
 
     # Catoni
     with Timer('C4.6'):
-        bound_values = np.array([catoni_4_6(k, float(m), d, delta, mprime=None, max_mprime=100*float(m)) for k, m in zip(ks, ms)])
+        bound_values = bound_curve(lambda k, m: catoni_4_6(k, float(m), d, delta, mprime=None, max_mprime=100*float(m)), ks, ms)
         print(ms[np.argmin((bound_values - .5)**2)])
         plot.add_plot(ms, bound_values - risk, legend='C4.6')
 
     # HTI
     with Timer('HTI'):
         def mprime(k, m):
-            best_mp = int(3.25*m)
-            best_bound = 1
-            for ratio in np.arange(3, 20, step=1):
-                mp = float(m)*ratio
-                bound = hypinv_upperbound(k, float(m), sauer_shelah(d), delta, mp)
-                if bound < best_bound:
-                    best_bound = bound
-                    best_mp = mp
-                elif bound > best_bound:
-                    break
-            return best_mp
-
-        bound_values = np.array([hypinv_upperbound(k, float(m), sauer_shelah(d), delta, mprime=mprime(k, m)) for k, m in zip(ks, ms)])
+            return optimize_mprime(k, float(m), sauer_shelah(d), delta, search='ratio', ratio_range=(3, 19))
+
+        bound_values = bound_curve(lambda k, m: hypinv_upperbound(k, float(m), sauer_shelah(d), delta, mprime=mprime(k, m)), ks, ms)
         print(ms[np.argmin((bound_values - .5)**2)])
         plot.add_plot(ms, bound_values - risk, legend='HTI')
 
@@ -5,12 +5,15 @@ from graal_utils import Timer
 
 from hypergeo import optimize_mprime, optimize_catoni
 from hypergeo import hypinv_upperbound, vapnik_pessismistic_bound, vapnik_relative_deviation_bound, catoni_4_6
-from hypergeo.utils import sauer_shelah
+from hypergeo.utils import sauer_shelah, cached_bound_curve
 
 import os
 path = os.path.dirname(__file__)
 
 
+bound_curve = cached_bound_curve(path+'/data')
+
+
 # Saved values of optimized m' for parameters (m, d, delta) using 'optimize_mprime(0, m, sauer_shelah(d), delta, max_mprime=13*m, min_mprime=3*m, early_stopping=1000)'
 mp_dict = {
     (100, 50, 0.05): 388,
@@ -87,7 +90,10 @@ def plot_risk_comp(m, d, delta=0.05, show_non_opti=False):
     ks = np.array([int(k) for k in np.linspace(0, m, num=100)])
     for name, bound, style, color in bounds:
         with Timer(name):
-            bs = [bound(k) for k in ks]
+            if name in ('VP', 'VRD'): # Closed forms, cheaper to compute than to cache
+                bs = np.array([bound(k) for k in ks])
+            else:
+                bs = bound_curve(bound, ks)
             plot.add_plot(ks/m, bs, style, color=color, legend=name)
             print(name, bs[0])
 
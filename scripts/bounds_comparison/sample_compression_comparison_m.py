@@ -3,13 +3,16 @@ import numpy as np
 import python2latex as p2l
 from graal_utils import Timer
 
-from hypergeo import hypinv_upperbound, sample_compression_bound
-from hypergeo.utils import sauer_shelah
+from hypergeo import optimize_mprime, hypinv_upperbound, sample_compression_bound
+from hypergeo.utils import sauer_shelah, cached_bound_curve
 
 import os
 path = os.path.dirname(__file__)
 
 
+bound_curve = cached_bound_curve(path+'/data')
+
+
 def plot_comp_m(risk, d, delta=0.05):
     ms = np.array(
         list(range(d, 100, 2))
@@ -42,25 +45,15 @@ def plot_comp_m(risk, d, delta=0.05):
     plot.legend_position = 'south west'
 
     with Timer('Sample compression'):
-        bound_values = np.array([sample_compression_bound(k, m, d, delta) for k, m in zip(ks, ms)])
+        bound_values = bound_curve(lambda k, m: sample_compression_bound(k, m, d, delta), ks, ms)
         print(ms[np.argmin((bound_values - .5)**2)])
         plot.add_plot(ms, bound_values - risk, legend='SC')
 
     with Timer('HTI'):
         def mprime(k, m):
-            best_mp = int(3.25*m)
-            best_bound = 1
-            for ratio in np.arange(3.25, 13, step=.25):
-                mp = int(m*ratio)
-                bound = hypinv_upperbound(k, m, sauer_shelah(d), delta, mp)
-                if bound < best_bound:
-                    best_bound = bound
-                    best_mp = mp
-                elif bound > best_bound:
-                    break
-            return best_mp
-
-        bound_values = np.array([hypinv_upperbound(k, m, sauer_shelah(d), delta, mprime=mprime(k, m)) for k, m in zip(ks, ms)])
+            return optimize_mprime(k, m, sauer_shelah(d), delta, search='ratio', ratio_range=(3.25, 13))
+
+        bound_values = bound_curve(lambda k, m: hypinv_upperbound(k, m, sauer_shelah(d), delta, mprime=mprime(k, m)), ks, ms)
         print(ms[np.argmin((bound_values - .5)**2)])
         plot.add_plot(ms, bound_values - risk, legend='HTI')
 
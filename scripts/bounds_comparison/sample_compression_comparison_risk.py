@@ -4,12 +4,15 @@ import python2latex as p2l
 from graal_utils import Timer
 
 from hypergeo import hypinv_upperbound, sample_compression_bound
-from hypergeo.utils import sauer_shelah
+from hypergeo.utils import sauer_shelah, cached_bound_curve
 
 import os
 path = os.path.dirname(__file__)
 
 
+bound_curve = cached_bound_curve(path+'/data')
+
+
 m, d, delta = 2000, 50, 0.05
 # mp = optimize_mprime(0, m, sauer_shelah(d), delta, max_mprime=10*m, min_mprime=3*m, early_stopping=1000)
 # print(mp)
@@ -52,7 +55,7 @@ bounds.reverse()
 ks = np.arange(0, m, 5)
 for name, bound, style, color in bounds:
     with Timer(name):
-        bs = [bound(k) for k in ks]
+        bs = bound_curve(bound, ks)
         plot.add_plot(ks/m, bs, style, color=color, legend=name)
         print(name, bs[0])
 
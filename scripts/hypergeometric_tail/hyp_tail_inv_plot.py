@@ -2,7 +2,7 @@ import numpy as np
 from python2latex import Document, Plot, holi
 from itertools import chain
 
-from hypergeo import hypergeometric_tail_inverse
+from hypergeo import hypergeometric_tail_inverse, hypergeometric_tail_inverse_profile
 
 import os
 path = os.path.dirname(__file__)
@@ -24,7 +24,7 @@ def plot_hyp_tail_inv_k(m, deltas, M):
         else:
             legend = str(delta)
 
-        plot.add_plot(ks, [hypergeometric_tail_inverse(k,m,delta,M) for k in ks], color=color, legend=f'\\scriptsize $\\delta={legend}$')
+        plot.add_plot(ks, hypergeometric_tail_inverse_profile(m,delta,M), color=color, legend=f'\\scriptsize $\\delta={legend}$')
 
     plot.legend_position = 'south east'
     plot.x_label = '$k$'
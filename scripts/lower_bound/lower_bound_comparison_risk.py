@@ -4,12 +4,15 @@ import python2latex as p2l
 from graal_utils import Timer
 
 from hypergeo import optimize_mprime, hypinv_upperbound, hypinv_lowerbound
-from hypergeo.utils import sauer_shelah
+from hypergeo.utils import sauer_shelah, cached_bound_curve
 
 import os
 path = os.path.dirname(__file__)
 
 
+bound_curve = cached_bound_curve(path+'/data')
+
+
 # Saved values of optimized m' for parameters (m, d, delta) using 'optimize_mprime(0, m, sauer_shelah(d), delta, max_mprime=13*m, min_mprime=3*m, early_stopping=1000)'
 mp_dict = {
     (2000, 20, 0.2): 7896,
@@ -55,7 +58,7 @@ def plot_risk_comp(m, d, delta=0.05):
     ks = np.array([int(k) for k in np.linspace(0, m, num=200)])
     for name, bound, style, color in bounds:
         with Timer(name):
-            bs = [bound(k) for k in ks]
+            bs = bound_curve(bound, ks)
             plot.add_plot(ks/m, bs, style, color=color, legend=name)
             print(name, bs[0])
 
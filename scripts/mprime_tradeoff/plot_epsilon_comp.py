@@ -1,12 +1,16 @@
 import numpy as np
-import pandas as pd
 
 import python2latex as p2l
 
+from hypergeo.curve_store import CurveStore
+
 import os
 path = os.path.dirname(__file__)
 
 
+store = CurveStore(path + '/data/mprime_tradeoff')
+
+
 def plot_comp_k(m, ks, d, delta=0.05):
 
     plot = p2l.Plot(plot_name=f'tradeoff_comp_k_{m=}_{d=}_{delta=}',
@@ -23,8 +27,7 @@ def plot_comp_k(m, ks, d, delta=0.05):
     plot.add_plot([m,m], [0,1], color=palette[0], line_width='1pt', opacity='.5', label="\\footnotesize $m'=m$", label_anchor='south')
 
     for k, color in zip(ks, palette[1:]):
-        datafile = path + f'/data/mprime_tradeoff-{m=}_{k=}_{d=}_{delta=}.csv'
-        df = pd.read_csv(datafile, sep=',', header=0)
+        df = store.mprime_curve(m=m, k=k, d=d, delta=delta)
         idx = list(range(0, 2000, 1)) + list(range(2000, 10_000, 500)) + [9_999]
         mprimes = [df['mprime'][i] for i in idx]
         bounds = [df['bound'][i] for i in idx]
@@ -55,8 +58,7 @@ def plot_comp_d(m, k, ds, delta=0.05):
     plot.add_plot([m,m], [0,1], palette[0], line_width='1pt', opacity='.5', label="\\footnotesize $m'=m$", label_anchor='south')
 
     for d, color in zip(ds, palette[1:]):
-        datafile = path + f'/data/mprime_tradeoff-{m=}_{k=}_{d=}_{delta=}.csv'
-        df = pd.read_csv(datafile, sep=',', header=0)
+        df = store.mprime_curve(m=m, k=k, d=d, delta=delta)
         idx = list(range(0, 2000)) + list(range(2000, 10_000, 500)) + [9_999]
         mprimes = [df['mprime'][i] for i in idx]
         bounds = [df['bound'][i] for i in idx]
@@ -90,8 +92,7 @@ def plot_comp_delta(m, k, d, deltas):
     # First line plot
     delta = deltas[0]
     color = palette[2]
-    datafile = path + f'/data/mprime_tradeoff-{m=}_{k=}_{d=}_{delta=}.csv'
-    df = pd.read_csv(datafile, sep=',', header=0)
+    df = store.mprime_curve(m=m, k=k, d=d, delta=delta)
     idx = list(range(0, 2000)) + list(range(2000, 10_000, 500)) + [9_999]
     mprimes = [df['mprime'][i] for i in idx]
     bounds = [df['bound'][i] for i in idx]
@@ -107,8 +108,7 @@ def plot_comp_delta(m, k, d, deltas):
     # Second line plot
     delta = deltas[1]
     color = palette[4]
-    datafile = path + f'/data/mprime_tradeoff-{m=}_{k=}_{d=}_{delta=}.csv'
-    df = pd.read_csv(datafile, sep=',', header=0)
+    df = store.mprime_curve(m=m, k=k, d=d, delta=delta)
     idx = list(range(0, 2000)) + list(range(2000, 10_000, 500)) + [9_999]
     mprimes = [df['mprime'][i] for i in idx]
     bounds = [df['bound'][i] for i in idx]
@@ -140,8 +140,7 @@ def plot_comp_m(ms, k, d, delta):
         plot.add_plot([m,m], [0,1], color=color, line_width='1pt', opacity='.5', label=f"\\footnotesize ${m}$", label_anchor='south')
 
     for m, color in zip(ms, palette[::2]):
-        datafile = path + f'/data/mprime_tradeoff-{m=}_{k=}_{d=}_{delta=}.csv'
-        df = pd.read_csv(datafile, sep=',', header=0)
+        df = store.mprime_curve(m=m, k=k, d=d, delta=delta)
         idx = list(range(0, 2000)) + list(range(2000, 10_000, 500)) + [9_999]
         mprimes = df['mprime']
         bounds = df['bound']
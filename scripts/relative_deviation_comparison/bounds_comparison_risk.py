@@ -3,12 +3,15 @@ from graal_utils import Timer
 import python2latex as p2l
 
 from hypergeo import hypinv_upperbound, hypinv_reldev_upperbound
-from hypergeo.utils import sauer_shelah
+from hypergeo.utils import sauer_shelah, cached_bound_curve
 
 import os
 path = os.path.dirname(__file__)
 
 
+bound_curve = cached_bound_curve(path+'/data')
+
+
 m, d, delta = 1000, 20, 0.05
 # mp = optimize_mprime(0, m, sauer_shelah(d), delta, max_mprime=20*m, min_mprime=3*m, early_stopping=200)
 # print(mp)
@@ -42,7 +45,7 @@ colors = p2l.holi(5)
 # HTI
 with Timer('HTI opti'):
     plot.add_plot(ks/m,
-              [hypinv_upperbound(k, m, sauer_shelah(d), delta, mprime=mp) for k in ks],
+              bound_curve(lambda k: hypinv_upperbound(k, m, sauer_shelah(d), delta, mprime=mp), ks),
               color=colors[0],
               line_width='.7pt',
               legend='HTI\\textsubscript{opti}',
@@ -50,7 +53,7 @@ with Timer('HTI opti'):
 
 with Timer("HTI m=m'"):
     plot.add_plot(ks/m,
-              [hypinv_upperbound(k, m, sauer_shelah(d), delta, mprime=m) for k in ks],
+              bound_curve(lambda k: hypinv_upperbound(k, m, sauer_shelah(d), delta, mprime=m), ks),
               color=colors[1],
               line_width='.7pt',
               legend="HTI$_{m'=m}$",
@@ -59,7 +62,7 @@ with Timer("HTI m=m'"):
 # HTI-RD
 with Timer('HTI-RD opti'):
     plot.add_plot(ks/m,
-              [hypinv_reldev_upperbound(k, m, sauer_shelah(d), delta, mprime=mp_rd) for k in ks],
+              bound_curve(lambda k: hypinv_reldev_upperbound(k, m, sauer_shelah(d), delta, mprime=mp_rd), ks),
               'dashed',
               color=colors[-2],
               legend='HTI-RD\\textsubscript{opti}',
@@ -67,7 +70,7 @@ with Timer('HTI-RD opti'):
 
 with Timer("HTI-RD m=m'"):
     plot.add_plot(ks/m,
-              [hypinv_reldev_upperbound(k, m, sauer_shelah(d), delta, mprime=m) for k in ks],
+              bound_curve(lambda k: hypinv_reldev_upperbound(k, m, sauer_shelah(d), delta, mprime=m), ks),
               'dashed',
               color=colors[-1],
               legend="HTI-RD$_{m'=m}$",
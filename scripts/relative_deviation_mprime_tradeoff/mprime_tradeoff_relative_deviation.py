@@ -1,9 +1,9 @@
 import numpy as np
-import csv
 from graal_utils import Timer
 
 from hypergeo import hypinv_reldev_upperbound
 from hypergeo.utils import sauer_shelah
+from hypergeo.curve_store import CurveStore
 
 import os
 path = os.path.dirname(__file__) + '/data/'
@@ -23,20 +23,21 @@ if __name__ == "__main__":
              [(k,x,d,delta) for x in ms] +\
              [(k,m,x,delta) for x in ds] +\
              [(k,m,d,x) for x in deltas]
+    # Removes duplicated configurations while preserving order
+    params = list(dict.fromkeys(params))
 
-    os.makedirs(path, exist_ok=True)
+    store = CurveStore.create(path + 'mprime_tradeoff',
+                              [{'k': k, 'm': m, 'd': d, 'delta': delta} for k, m, d, delta in params],
+                              length=max_mprime)
 
     # Generates all the data and saves it
-    for k, m, d, delta in params:
-        filename = f'mprime_tradeoff-{m=}_{k=}_{d=}_{delta=}'
-
-        with open(path + filename + '.csv', 'w', newline='') as file:
-            writer = csv.writer(file)
-            writer.writerow(['mprime', 'bound'])
-            with Timer(f'm={m}, k={k}, d={d}, delta={delta}'):
-                bounds = np.zeros(max_mprime)
-                for mp in range(1, max_mprime+1):
-                    bounds[mp-1] = hypinv_reldev_upperbound(k, m, sauer_shelah(d), delta, mprime=mp)
-                    print(f'Computing bounds: {mp}/{max_mprime}', end='\r')
-                for mp, bound in enumerate(bounds, start=1):
-                    writer.writerow([mp, bound])
+    for row, (k, m, d, delta) in enumerate(params):
+        if store.done[row]:
+            continue
+
+        with Timer(f'm={m}, k={k}, d={d}, delta={delta}'):
+            bounds = np.zeros(max_mprime)
+            for mp in range(1, max_mprime+1):
+                bounds[mp-1] = hypinv_reldev_upperbound(k, m, sauer_shelah(d), delta, mprime=mp)
+                print(f'Computing bounds: {mp}/{max_mprime}', end='\r')
+            store.write(row, bounds)
@@ -23,6 +23,9 @@ setuptools.setup(
         'pandas',
         'xarray',
     ],
+    extras_require={
+        'numba': ['numba'],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
@@ -0,0 +1,63 @@
+import asyncio
+import numpy as np
+
+from hypergeo import aio
+from hypergeo.generalization_bounds import hypinv_upperbound, hypinv_lowerbound, optimize_mprime
+
+
+d = 5
+growth_function = lambda M: (np.e*M/d)**d
+
+
+def test_aio_hypinv_upperbound_is_same_as_sync():
+    k, m = 5, 50
+    bound = asyncio.run(aio.hypinv_upperbound(k, m, growth_function, max_mprime=3*m))
+    assert bound == hypinv_upperbound(k, m, growth_function, max_mprime=3*m)
+    bound = asyncio.run(aio.hypinv_lowerbound(k, m, growth_function, mprime=2*m))
+    assert bound == hypinv_lowerbound(k, m, growth_function, mprime=2*m)
+
+
+def test_aio_optimize_mprime_is_same_as_sync():
+    k, m = 5, 50
+    for early_stopping in [np.inf, 10]:
+        result = asyncio.run(aio.optimize_mprime(k, m, growth_function, 0.05, max_mprime=200, early_stopping=early_stopping, return_bound=True, chunk_size=16))
+        assert result == optimize_mprime(k, m, growth_function, 0.05, max_mprime=200, early_stopping=early_stopping, return_bound=True)
+
+
+def test_aio_optimize_mprime_has_same_search_options_as_sync():
+    k, m = 5, 50
+    for kwargs in [dict(search='linear', max_mprime=200, early_stopping=10, chunk_size=3),
+                   dict(search='ratio', ratio_range=(1, 16), ratio_step=2**.5),
+                   dict(search='ratio', optimization_mode='max', bound=hypinv_lowerbound)]:
+        chunk_size = kwargs.pop('chunk_size', 256)
+        result = asyncio.run(aio.optimize_mprime(k, m, growth_function, 0.05, return_bound=True, return_n_evaluations=True, chunk_size=chunk_size, **kwargs))
+        assert result == optimize_mprime(k, m, growth_function, 0.05, return_bound=True, return_n_evaluations=True, **kwargs)
+
+
+def test_aio_deduplicates_identical_calls():
+    calls = []
+    def counting_growth_function(M):
+        calls.append(M)
+        return growth_function(M)
+
+    async def run():
+        return await asyncio.gather(*(aio.hypinv_upperbound(5, 50, counting_growth_function, mprime=100) for _ in range(5)))
+
+    bounds = asyncio.run(run())
+    assert len(set(bounds)) == 1
+    assert len(calls) == 1
+
+
+def test_aio_optimize_mprime_can_be_cancelled():
+    async def run():
+        task = asyncio.create_task(aio.hypinv_upperbound(5, 50, growth_function, max_mprime=100_000))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            return True
+        return False
+
+    assert asyncio.run(run())
+    assert not aio._in_flight
@@ -0,0 +1,27 @@
+from hypergeo.benchmark import *
+
+
+def test_run_benchmark_agrees_and_report_round_trips(tmp_path):
+    points = random_points(4, seed=1, m_range=(10, 30), ratio_range=(1, 4), delta_range=(1e-10, .5))
+    rows = run_benchmark(points, ['bisection_log', 'asymptotic', 'batch', 'logberkopec_below', 'naive_below'], n_repeats=1)
+    assert len(rows) == 4*6
+    assert all(row['status'] == 'ok' for row in rows)
+
+    path = str(tmp_path / 'benchmark.csv')
+    write_report(rows, path)
+    assert read_report(path) == rows
+
+    summary = summarize(rows, baseline=rows)
+    assert 'logberkopec_below' in summary
+    assert '0 disagreement(s)' in summary
+    assert '0 slowdown(s)' in summary
+
+
+def test_summarize_reports_disagreements_and_slowdowns():
+    rows = run_benchmark([(2, 20, .1, 60)], ['asymptotic'], n_repeats=1)
+    rows[1]['K'] += 1
+    rows[1]['status'] = 'disagreement'
+    baseline = [dict(row, time=row['time']/10) for row in rows]
+    summary = summarize(rows, baseline=baseline, slowdown=2)
+    assert '1 disagreement(s)' in summary
+    assert '2 slowdown(s)' in summary
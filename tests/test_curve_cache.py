@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from hypergeo.utils.curve_cache import *
+from hypergeo.utils import curve_cache
+from hypergeo.utils import sauer_shelah
+from hypergeo import hypinv_upperbound
+
+
+def test_cached_curve_reuses_curves_with_same_data(tmp_path):
+    @cached_curve(tmp_path)
+    def bound_curve(bound, *params):
+        return np.array([bound(*p) for p in zip(*params)])
+
+    ks, m = np.arange(0, 20, 5), 20
+    for d in [2, 3]:
+        expected = [hypinv_upperbound(k, m, sauer_shelah(d), 0.05, mprime=2*m) for k in ks]
+        for _ in range(2):
+            assert list(bound_curve(lambda k: hypinv_upperbound(k, m, sauer_shelah(d), 0.05, mprime=2*m), ks)) == expected
+    files = list((tmp_path / 'bound_curve').iterdir())
+    assert len(files) == 2
+
+    # Cached curves are read from the disk instead of being recomputed.
+    for file in files:
+        np.save(file, np.zeros(1))
+    for d in [2, 3]:
+        assert list(bound_curve(lambda k: hypinv_upperbound(k, m, sauer_shelah(d), 0.05, mprime=2*m), ks)) == [0]
+
+    bound_curve(lambda k: hypinv_upperbound(k, m, sauer_shelah(d), 0.05, mprime=3*m), ks)
+    bound_curve(lambda k: hypinv_upperbound(k, m, sauer_shelah(d), 0.05, mprime=2*m), ks[:-1])
+    assert len(list((tmp_path / 'bound_curve').iterdir())) == 4
+
+
+def test_curve_key_depends_on_closures_and_globals():
+    d = 3
+    key = curve_key(np.mean, lambda k: sauer_shelah(d)(k))
+    assert key == curve_key(np.mean, lambda k: sauer_shelah(d)(k))
+    d = 4
+    assert key != curve_key(np.mean, lambda k: sauer_shelah(d)(k))
+    assert curve_key(np.mean, sauer_shelah(3)) != curve_key(np.mean, sauer_shelah(4))
+    with pytest.raises(TypeError):
+        curve_key(np.mean, object())
+
+
+def test_cached_bound_curve_is_cached_curve_of_bound(tmp_path):
+    bound_curve = cached_bound_curve(tmp_path)
+    ks, m = np.arange(0, 20, 5), 20
+    expected = [hypinv_upperbound(k, m, sauer_shelah(2), 0.05, mprime=2*m) for k in ks]
+    assert list(bound_curve(lambda k: hypinv_upperbound(k, m, sauer_shelah(2), 0.05, mprime=2*m), ks)) == expected
+    assert len(list((tmp_path / 'bound_curve').iterdir())) == 1
+
+
+def test_curve_key_depends_only_on_modules_of_functions_used(monkeypatch):
+    key = curve_key(np.mean, hypinv_upperbound)
+    source_fingerprint = curve_cache._source_fingerprint
+    def edit_module(module):
+        monkeypatch.setattr(curve_cache, '_source_fingerprint', lambda filename: source_fingerprint(filename) + ('edited' if filename.endswith(module) else ''))
+
+    edit_module('grid.py')
+    assert curve_key(np.mean, hypinv_upperbound) == key
+    edit_module('generalization_bounds.py')
+    assert curve_key(np.mean, hypinv_upperbound) != key
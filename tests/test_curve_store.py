@@ -0,0 +1,42 @@
+import numpy as np
+
+from hypergeo.curve_store import *
+
+
+def test_curve_store_write_and_read(tmp_path):
+    params = [{'k': k, 'm': 100, 'd': 10, 'delta': 0.05} for k in [0, 10, 30]]
+    store = CurveStore.create(tmp_path, params, length=50)
+    for row, k in enumerate([0, 10, 30]):
+        store.write(row, np.linspace(0, 1, 50) + k)
+
+    store = CurveStore(tmp_path)
+    curve = store.curve(k=10, delta=0.05)
+    assert np.all(curve == np.linspace(0, 1, 50) + 10)
+    assert isinstance(curve, np.memmap)
+    assert not curve.flags.writeable
+
+    curve = store.mprime_curve(k=30)
+    assert np.all(curve['mprime'] == np.arange(1, 51))
+    assert np.all(curve['bound'] == np.linspace(0, 1, 50) + 30)
+
+
+def test_curve_store_create_reopens_existing_store(tmp_path):
+    params = [{'k': k, 'm': 100} for k in [0, 10]]
+    store = CurveStore.create(tmp_path, params, length=5, dtype=np.float32)
+    store.write(1, np.arange(5))
+
+    store = CurveStore.create(tmp_path, params, length=5, dtype=np.float32)
+    assert list(store.done) == [False, True]
+    assert store.curves.dtype == np.float32
+
+
+def test_curve_store_missing_curve_raises(tmp_path):
+    params = [{'k': k, 'm': 100} for k in [0, 10]]
+    store = CurveStore.create(tmp_path, params, length=5)
+    store.write(0, np.arange(5))
+    for query in [{'k': 10}, {'k': 20}, {'m': 100}]:
+        try:
+            store.curve(**query)
+            assert False
+        except KeyError:
+            pass
@@ -0,0 +1,43 @@
+import io
+import json
+
+from hypergeo.utils.func_to_cmd import run_batch, func_to_cmd
+
+
+def ratio(a=1, b=1.0):
+    return a/b
+
+
+def test_run_batch_jsonl_preserves_order_and_reports_errors(tmp_path):
+    path = tmp_path / 'batch.jsonl'
+    path.write_text('{"a": 1, "b": 2}\n{"a": 3, "b": 0}\nnot json\n\n{"b": 4}\n')
+
+    for n_workers in [1, 2]:
+        output = io.StringIO()
+        run_batch(ratio, str(path), n_workers=n_workers, defaults={'a': 2, 'b': 1.0}, output=output)
+        rows = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert [row['result'] for row in rows] == [.5, None, None, .5]
+        assert rows[1]['error'].startswith('ZeroDivisionError')
+        assert rows[2]['error'].startswith('JSONDecodeError')
+        assert rows[3]['error'] is None
+
+
+def test_run_batch_csv_converts_values(tmp_path):
+    path = tmp_path / 'batch.csv'
+    path.write_text('a,b\n1,2\n3,\n')
+
+    output = io.StringIO()
+    run_batch(ratio, str(path), defaults={'a': 1, 'b': 4.0}, value_types={'a': int, 'b': float}, output=output)
+    assert output.getvalue().splitlines() == ['a,b,result,error', '1,2,0.5,', '3,,0.75,']
+
+
+def test_batch_mode_reads_csv_values_of_none_defaults_as_strings(tmp_path, monkeypatch, capsys):
+    @func_to_cmd
+    def describe(a=1, name=None):
+        return f'{name}:{a+1}'
+
+    path = tmp_path / 'batch.csv'
+    path.write_text('a,name\n1,x\n2,\n')
+    monkeypatch.setattr('sys.argv', ['describe', f'--batch={path}'])
+    describe()
+    assert capsys.readouterr().out.splitlines() == ['a,name,result,error', '1,x,x:2,', '2,,None:3,']
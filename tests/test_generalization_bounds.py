@@ -1,4 +1,5 @@
 from hypergeo.generalization_bounds import *
+from hypergeo.utils import sauer_shelah, log_sauer_shelah, exact_log_sauer_shelah
 
 
 def test_hypinv_upperbound():
@@ -22,3 +23,60 @@ def test_hypinv_lowerbound():
     assert best_bound <= 1
     assert best_bound >= 0
     assert hypinv_lowerbound(k, m, growth_function, mprime=3*m) < best_bound
+
+
+def test_hypinv_lowerbound_log_delta_is_same_as_delta():
+    k, m, d = 100, 500, 10
+    assert hypinv_lowerbound(k, m, sauer_shelah(d), mprime=4*m) == hypinv_lowerbound(k, m, log_sauer_shelah(d), np.log(0.05), mprime=4*m, log_delta=True)
+    # The growth function overflows for large d, but not its logarithm.
+    assert 0 <= hypinv_lowerbound(k, m, log_sauer_shelah(500), np.log(0.05), mprime=4*m, log_delta=True) < k/m
+
+
+def test_batch_hypinv_upperbound_is_same_as_scalar():
+    m, d = 50, 5
+    growth_function = lambda M: (np.e*M/d)**d
+    ks, mprimes = np.array([0, 5, 25, 50]), np.array([50, 100, 150, 200])
+
+    bounds = batch_hypinv_upperbound(ks, m, growth_function, 0.05, mprimes)
+    assert list(bounds) == [hypinv_upperbound(k, m, growth_function, 0.05, mprime=mprime) for k, mprime in zip(ks, mprimes)]
+
+
+def test_optimize_mprime_ratio_search():
+    k, m, d = 10, 200, 5
+    growth_function = sauer_shelah(d)
+    mprime, bound, n_evaluations = optimize_mprime(k, m, growth_function, 0.05, search='ratio', return_bound=True, return_n_evaluations=True)
+    assert bound == hypinv_upperbound(k, m, growth_function, mprime=mprime)
+    assert n_evaluations < 50
+
+    best_bound = optimize_mprime(k, m, growth_function, 0.05, max_mprime=32*m, return_bound=True)[1]
+    assert best_bound <= bound <= 1.01*best_bound
+
+    mprime, bound = optimize_mprime(k, float(m), growth_function, 0.05, search='ratio', ratio_range=(3, 19), return_bound=True)
+    assert isinstance(mprime, float) and mprime == int(mprime) and 3*m <= mprime <= 19*m
+    assert bound == hypinv_upperbound(k, m, growth_function, mprime=int(mprime))
+
+
+def test_hypinv_interval_is_same_as_separate_bounds():
+    d = 3
+    for k, m in [(0, 40), (5, 40), (40, 40), (30, 100)]:
+        for mprime in [m, 4*m, 20*m]:
+            assert hypinv_interval(k, m, sauer_shelah(d), mprime=mprime) == (hypinv_lowerbound(k, m, sauer_shelah(d), mprime=mprime), hypinv_upperbound(k, m, sauer_shelah(d), mprime=mprime))
+            assert hypinv_interval(k, m, log_sauer_shelah(d), np.log(0.05), mprime=mprime, log_delta=True) == (hypinv_lowerbound(k, m, log_sauer_shelah(d), np.log(0.05), mprime=mprime, log_delta=True), hypinv_upperbound(k, m, log_sauer_shelah(d), np.log(0.05), mprime=mprime, log_delta=True))
+        assert hypinv_interval(k, m, sauer_shelah(d), max_mprime=5*m) == (hypinv_lowerbound(k, m, sauer_shelah(d), max_mprime=5*m), hypinv_upperbound(k, m, sauer_shelah(d), max_mprime=5*m))
+
+
+def test_optimize_mprime_max_mode_maximizes():
+    k, m, growth_function = 30, 100, sauer_shelah(3)
+    mprime, bound = optimize_mprime(k, m, growth_function, 0.05, max_mprime=500, bound=hypinv_lowerbound, optimization_mode='max', return_bound=True)
+    assert bound == max(hypinv_lowerbound(k, m, growth_function, mprime=mp) for mp in range(1, 501)) > 0
+
+
+def test_hypinv_sample_complexity_is_smallest_m():
+    epsilon, risk, d = .2, .1, 5
+    for growth_function in [log_sauer_shelah(d), exact_log_sauer_shelah(d)]:
+        m, mprime = hypinv_sample_complexity(epsilon, risk, growth_function=growth_function)
+        k = round(risk*m)
+        assert hypinv_upperbound(k, m, growth_function, np.log(0.05), mprime=mprime, log_delta=True) - k/m <= epsilon
+        k = round(risk*(m-1))
+        _, bound = optimize_mprime(k, m-1, growth_function, np.log(0.05), return_bound=True, log_delta=True, search='ratio')
+        assert bound - k/(m-1) > epsilon
@@ -0,0 +1,63 @@
+import numpy as np
+import xarray as xr
+
+from hypergeo.grid import *
+from hypergeo.generalization_bounds import hypinv_upperbound, hypinv_reldev_upperbound
+
+
+def test_evaluate_grid_vectorized_is_same_as_scalar():
+    ks, ms, d, delta = np.array([0, 5, 10]), np.array([50, 100]), 5, 0.05
+    grid = evaluate_grid(vapnik_pessismistic_bound, k=ks, m=ms, d=d, delta=delta)
+    assert grid.dims == ('k', 'm')
+    for k in ks:
+        for m in ms:
+            assert np.isclose(grid.sel(k=k, m=m), vapnik_pessismistic_bound(k, m, sauer_shelah(d), delta))
+
+
+def test_evaluate_grid_pool_is_same_as_serial():
+    ks, mprimes = np.array([0, 2, 4]), np.array([20, 40])
+    serial = evaluate_grid(hypinv_reldev_upperbound, k=ks, m=20, d=2, delta=0.05, mprime=mprimes, n_workers=1)
+    parallel = evaluate_grid(hypinv_reldev_upperbound, k=ks, m=20, d=2, delta=0.05, mprime=mprimes, n_workers=2, chunk_size=4)
+    assert serial.equals(parallel)
+    assert serial.sel(k=2, mprime=40) == hypinv_reldev_upperbound(2, 20, sauer_shelah(2), 0.05, mprime=40)
+
+
+def test_evaluate_grid_hypinv_upperbound_is_vectorized():
+    ks, mprimes = np.array([0, 2, 20]), np.array([20, 40])
+    grid = evaluate_grid(hypinv_upperbound, k=ks, m=20, d=2, delta=0.05, mprime=mprimes)
+    for k in ks:
+        for mprime in mprimes:
+            assert grid.sel(k=k, mprime=mprime) == hypinv_upperbound(k, 20, sauer_shelah(2), 0.05, mprime=mprime)
+
+
+def test_evaluate_grid_broadcasts_data_arrays():
+    ms = np.array([50, 100, 200])
+    ks = xr.DataArray(ms//10, dims='m', coords={'m': ms})
+    grid = evaluate_grid(lugosi_chaining, k=ks, m=ms, d=5, delta=xr.DataArray([.05, .1], dims='delta'))
+    assert grid.shape == (3, 2)
+    assert np.isclose(grid.sel(m=100)[1], lugosi_chaining(10, 100, 5, .1))
+
+
+def test_evaluate_grid_streams_to_disk(tmp_path):
+    path = tmp_path / 'grid.npy'
+    grid = evaluate_grid(lugosi_chaining, k=np.arange(10), m=100, d=np.arange(1, 6), delta=0.05, chunk_size=7, path=path)
+    assert np.all(np.load(path) == grid.values)
+
+
+def test_evaluate_grid_pool_shares_data_arrays_and_writes_to_disk(tmp_path):
+    ms = np.array([20, 30])
+    ks = xr.DataArray([[1, 2, 3], [4, 5, 6]], dims=('m', 'k_index'), coords={'m': ms})
+    path = tmp_path / 'grid.npy'
+    serial = evaluate_grid(hypinv_reldev_upperbound, k=ks, m=ms, d=2, delta=0.05, mprime=40, n_workers=1)
+    parallel = evaluate_grid(hypinv_reldev_upperbound, k=ks, m=ms, d=2, delta=0.05, mprime=40, n_workers=2, path=path)
+    assert serial.equals(parallel)
+    assert np.all(np.load(path) == serial.values)
+    assert parallel.sel(m=30)[2] == hypinv_reldev_upperbound(6, 30, sauer_shelah(2), 0.05, mprime=40)
+
+
+def test_evaluate_grid_pool_aligns_coordinates():
+    ks = xr.DataArray([1, 4], dims='m', coords={'m': [20, 30]})
+    serial = evaluate_grid(hypinv_reldev_upperbound, k=ks, m=np.array([30, 20]), d=2, delta=0.05, mprime=40, n_workers=1)
+    parallel = evaluate_grid(hypinv_reldev_upperbound, k=ks, m=np.array([30, 20]), d=2, delta=0.05, mprime=40, n_workers=2)
+    assert serial.equals(parallel)
+    assert parallel.sel(m=30) == hypinv_reldev_upperbound(4, 30, sauer_shelah(2), 0.05, mprime=40)
@@ -121,3 +121,88 @@ def test_naive_hypergeometric_tail_inverse_above_is_inverse():
 
     for delta in [0.05, 0.1, 0.25]:
         assert hypergeometric_tail(k, m, naive_hypergeometric_tail_inverse(k,m,delta,M, start='above'), M) <= delta
+
+
+def test_batch_hypergeometric_tail_inverse_is_same_as_scalar():
+    ks, m, M = np.arange(0, 21), 20, 60
+    for delta in [0.05, 0.25, 10e-20]:
+        Ks = batch_hypergeometric_tail_inverse(ks, m, delta, M)
+        assert list(Ks) == [hypergeometric_tail_inverse(k, m, delta, M) for k in ks]
+        Ks = batch_hypergeometric_tail_inverse(ks, m, np.log(delta), M, log_delta=True)
+        assert list(Ks) == [hypergeometric_tail_inverse(k, m, np.log(delta), M, log_delta=True) for k in ks]
+
+
+def test_hypergeometric_tail_inverse_profile_is_same_as_scalar():
+    for m, M in [(20, 60), (50, 2000)]:
+        for delta in [0.05, 0.999, 10e-20]:
+            assert list(hypergeometric_tail_inverse_profile(m, delta, M)) == [hypergeometric_tail_inverse(k, m, delta, M) for k in range(m+1)]
+            assert list(hypergeometric_tail_inverse_profile(m, np.log(delta), M, log_delta=True)) == [hypergeometric_tail_inverse(k, m, np.log(delta), M, log_delta=True) for k in range(m+1)]
+
+
+def test_asymptotic_hypergeometric_tail_inverse_is_same_as_bisection():
+    for k, m, M in [(0, 100, 2000), (10, 1000, 20_000), (400, 1000, 1001), (100, 1000, 1000 + 3*2**20)]:
+        for delta in [0.05, 0.5, 10e-20]:
+            expected = hypergeometric_tail_inverse(k, m, delta, M)
+            assert asymptotic_hypergeometric_tail_inverse(k, m, delta, M) == expected
+            assert asymptotic_hypergeometric_tail_inverse(k, m, np.log(delta), M, log_delta=True) == hypergeometric_tail_inverse(k, m, np.log(delta), M, log_delta=True)
+            assert hypergeometric_tail(k, m, expected, M) <= delta < hypergeometric_tail(k, m, expected-1, M)
+
+
+def test_binomial_bracket_contains_tail_inverse():
+    from hypergeo.hypergeometric_distribution import _binomial_bracket
+    for k, m, M in [(0, 100, 2000), (10, 100, 10**6), (90, 100, 10**5)]:
+        for delta in [0.05, 0.5, 10e-20]:
+            K = hypergeometric_tail_inverse(k, m, delta, M)
+            K_min, K_max = _binomial_bracket(k, m, delta, M, k, M-m+k+1)
+            assert K_min < K <= K_max
+            assert K_max - K_min <= 2*m
+
+
+def test_hypergeometric_tail_lower_inverse_log_delta_is_same_as_delta():
+    k, m, _, M = 20, 150, 52, 222
+    for one_minus_delta in [0.05, 0.5, 10e-20]:
+        assert hypergeometric_tail_lower_inverse(k, m, one_minus_delta, M) == hypergeometric_tail_lower_inverse(k, m, np.log(one_minus_delta), M, log_delta=True)
+
+
+def test_berkopec_solver_is_same_as_berkopec():
+    m, M = 50, 200
+    solver, log_solver = BerkopecSolver(m, M), BerkopecSolver(m, M, log=True)
+    # Queries in both directions for the same k, so that the cached sums move down and up.
+    for k, delta in [(7, 0.05), (7, 0.25), (7, 0.1), (3, 0.5), (7, 10e-10), (3, 0.05), (50, 0.05)]:
+        assert solver.tail_inverse(k, delta) == berkopec_hypergeometric_tail_inverse(k, m, delta, M)
+        if k < m:
+            assert log_solver.tail_inverse(k, np.log(delta)) == logberkopec_hypergeometric_tail_inverse(k, m, np.log(delta), M, backend='python')
+
+
+def test_logberkopec_hypergeometric_tail_inverse_above_is_exact_for_small_deltas():
+    for k, m, M in [(2, 100, 5000), (10, 500, 20_000)]:
+        for delta in [10e-14, 10e-30, 10e-100]:
+            expected = hypergeometric_tail_inverse(k, m, np.log(delta), M, log_delta=True)
+            assert logberkopec_hypergeometric_tail_inverse(k, m, np.log(delta), M, start='above') == expected
+            assert logberkopec_hypergeometric_tail_inverse(k, m, np.log(delta), M, start='below') == expected
+
+
+def test_blocked_logberkopec_hypergeometric_tail_inverse_is_same_as_bisection():
+    for k, m, M in [(5, 13, 30), (7, 50, 200), (0, 100, 3000), (10, 500, 20_000), (13, 13, 30)]:
+        for delta in [0.5, 0.05, 10e-20]:
+            expected = hypergeometric_tail_inverse(k, m, np.log(delta), M, log_delta=True)
+            # Small blocks so that the crossing is found after a few blocks.
+            assert blocked_logberkopec_hypergeometric_tail_inverse(k, m, np.log(delta), M, block_size=7) == expected
+
+
+def test_chunked_log_hypergeometric_tail_is_exact():
+    from fractions import Fraction
+    from math import comb as exact_comb, log
+    for k, m, K, M in [(5, 13, 16, 30), (50, 200, 500, 1000), (0, 100, 3, 1000), (400, 1000, 500, 2000), (10, 1000, 600_000, 1_000_000)]:
+        cdf = Fraction(sum(exact_comb(K, j)*exact_comb(M-K, m-j) for j in range(k+1)), exact_comb(M, m))
+        log_cdf = log(cdf.numerator) - log(cdf.denominator)
+        # Small chunks so that several chunks are summed.
+        assert abs(chunked_log_hypergeometric_tail(k, m, K, M, chunk_size=16) - log_cdf) <= 1e-11*max(1, abs(log_cdf))
+        assert np.isclose(hypergeometric_tail(k, m, K, M), np.exp(chunked_log_hypergeometric_tail(k, m, K, M)), rtol=1e-12, atol=0)
+
+
+def test_asymptotic_bracket_keeps_k_infeasible_when_delta_is_one():
+    m, M = 100, 2**21 + 100
+    for k in [0, 5]:
+        assert hypergeometric_tail_inverse(k, m, 1., M) == asymptotic_hypergeometric_tail_inverse(k, m, 1., M) == k + 1
+        assert hypergeometric_tail_inverse(k, m, 0., M, log_delta=True) == asymptotic_hypergeometric_tail_inverse(k, m, 0., M, log_delta=True) == k + 1
@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from hypergeo.inverse_table import *
+from hypergeo.hypergeometric_distribution import hypergeometric_tail_inverse
+
+
+def test_inverse_table_is_same_as_tail_inverse(tmp_path):
+    m, M, deltas = 30, 100, [0.05, 0.5, 10e-20]
+    table = InverseTable.build(tmp_path / 'table.bin', m, M, deltas)
+    assert table.table.dtype == np.uint8
+    for delta in deltas:
+        assert list(table.lookup(np.arange(m+1), delta)) == [hypergeometric_tail_inverse(k, m, delta, M) for k in range(m+1)]
+    assert table.lookup(3, 0.05) == hypergeometric_tail_inverse(3, m, 0.05, M)
+
+
+def test_inverse_table_reopens_existing_file(tmp_path):
+    path = tmp_path / 'table.bin'
+    table = InverseTable.build(path, 10, 40, [np.log(0.05)], log_delta=True)
+    reopened = InverseTable(path)
+    assert (reopened.m, reopened.M, reopened.deltas, reopened.log_delta) == (10, 40, [np.log(0.05)], True)
+    assert np.all(reopened.table == table.table)
+    assert np.all(InverseTable.build(path, 10, 40, [np.log(0.05)], log_delta=True).table == table.table)
+    with pytest.raises(ValueError):
+        InverseTable.build(path, 10, 41, [np.log(0.05)], log_delta=True)
+    with pytest.raises(KeyError):
+        reopened.lookup(2, 0.05)
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+from scipy.stats import hypergeom
+
+from hypergeo import jit
+from hypergeo.hypergeometric_distribution import *
+from hypergeo.hypergeometric_distribution import _refine_logberkopec_inverse
+
+
+def test_log_hypergeometric_tail_is_close_to_scipy():
+    for k, m, K, M in [(5, 13, 16, 30), (20, 200, 42, 222), (0, 100, 3, 1000), (50, 200, 500, 1000), (3, 1000, 20_000, 1_000_000)]:
+        log_cdf, error = jit.log_hypergeometric_tail(k, m, K, M)
+        assert abs(log_cdf - hypergeom.logcdf(k, M, K, m)) <= error
+        assert abs(log_cdf - chunked_log_hypergeometric_tail(k, m, K, M)) <= error
+
+
+def test_tail_inverse_bisection_is_same_as_python():
+    for k, m, M in [(5, 13, 30), (20, 200, 222), (0, 100, 1100), (10, 1000, 11_000)]:
+        for delta in [0.05, 0.25, 10e-20]:
+            K_min, K_max, done = jit.tail_inverse_bisection(k, m, delta, M, False, k, M-m+k+1)
+            if done:
+                assert K_max == hypergeometric_tail_inverse(k, m, delta, M, backend='python')
+            else:
+                assert K_min < hypergeometric_tail_inverse(k, m, delta, M, backend='python') <= K_max
+
+
+def test_tail_inverse_bisection_stops_on_near_ties():
+    k, m, K, M = 20, 200, 42, 222
+    delta = hypergeometric_tail(k, m, K, M)
+    K_min, K_max, done = jit.tail_inverse_bisection(k, m, delta, M, False, k, M-m+k+1)
+    assert not done
+    assert K_min < K <= K_max
+
+
+def test_backends_give_same_results():
+    ks, m, M = np.arange(0, 21), 20, 60
+    for delta in [0.05, 0.25, 10e-20]:
+        for backend in ['auto', 'python']:
+            assert [hypergeometric_tail_inverse(k, m, delta, M, backend=backend) for k in ks] == [hypergeometric_tail_inverse(k, m, delta, M, backend='python') for k in ks]
+            assert list(batch_hypergeometric_tail_inverse(ks, m, delta, M, backend=backend)) == [hypergeometric_tail_inverse(k, m, delta, M) for k in ks]
+            assert logberkopec_hypergeometric_tail_inverse(7, 50, np.log(delta), 200, backend=backend) == logberkopec_hypergeometric_tail_inverse(7, 50, np.log(delta), 200, backend='python')
+
+
+def test_logberkopec_tail_inverse_kernel():
+    k, m, M = 7, 50, 200
+    for delta in [0.05, 0.1, 0.25]:
+        expected = logberkopec_hypergeometric_tail_inverse(k, m, np.log(delta), M, backend='python')
+        assert jit.logberkopec_tail_inverse(k, m, np.log(delta), M, False) == expected
+        assert jit.logberkopec_tail_inverse(k, m, np.log(delta), M, True) == expected
+
+
+def test_unknown_backend_raises():
+    with pytest.raises(ValueError):
+        jit.set_backend('cuda')
+    if not jit.NUMBA_AVAILABLE:
+        with pytest.raises(ImportError):
+            hypergeometric_tail_inverse(5, 13, 0.05, 30, backend='numba')
+
+
+def test_numba_backend_is_same_as_python():
+    pytest.importorskip('numba')
+    m, M = 50, 400
+    for delta in [0.05, 10e-9, 10e-40]:
+        for k in [0, 3, 20, 49]:
+            assert hypergeometric_tail_inverse(k, m, delta, M, backend='numba') == hypergeometric_tail_inverse(k, m, delta, M, backend='python')
+            assert asymptotic_hypergeometric_tail_inverse(k, m, delta, M, backend='numba') == asymptotic_hypergeometric_tail_inverse(k, m, delta, M, backend='python')
+            assert logberkopec_hypergeometric_tail_inverse(k, m, np.log(delta), M, start='above', backend='numba') == logberkopec_hypergeometric_tail_inverse(k, m, np.log(delta), M, start='above', backend='python')
+            assert logberkopec_hypergeometric_tail_inverse(k, m, np.log(delta), M, start='below', backend='numba') == logberkopec_hypergeometric_tail_inverse(k, m, np.log(delta), M, start='below', backend='python')
+        assert np.array_equal(batch_hypergeometric_tail_inverse(np.arange(m+1), m, delta, M, backend='numba'), batch_hypergeometric_tail_inverse(np.arange(m+1), m, delta, M, backend='python'))
+        assert np.array_equal(hypergeometric_tail_inverse_profile(m, delta, M, backend='numba'), hypergeometric_tail_inverse_profile(m, delta, M, backend='python'))
+
+
+def test_refined_logberkopec_kernel_is_same_as_python():
+    # Without numba, the kernels are plain Python functions, so the refinement of their results can be checked in any environment.
+    for k, m, M in [(0, 20, 60), (7, 50, 200), (30, 100, 1000)]:
+        for delta in [0.5, 0.05, 10e-9, 10e-40]:
+            log_delta = np.log(delta)
+            for above in [log_delta >= np.log(10e-9), False]:
+                K = jit.logberkopec_tail_inverse(k, m, log_delta, M, above)
+                expected = logberkopec_hypergeometric_tail_inverse(k, m, log_delta, M, start='above' if above else 'below', backend='python')
+                assert _refine_logberkopec_inverse(k, m, log_delta, M, K) == expected == hypergeometric_tail_inverse(k, m, log_delta, M, log_delta=True)
+    # Near ties, the kernel and the python loops may disagree before the refinement.
+    k, m, M = 20, 200, 222
+    log_delta = log_hypergeometric_tail(k, m, 42, M)
+    K = jit.logberkopec_tail_inverse(k, m, log_delta, M, False)
+    assert _refine_logberkopec_inverse(k, m, log_delta, M, K) == logberkopec_hypergeometric_tail_inverse(k, m, log_delta, M, backend='python') == 42
@@ -0,0 +1,29 @@
+import numpy as np
+
+from hypergeo.monitor import *
+from hypergeo.generalization_bounds import hypinv_upperbound, optimize_mprime
+from hypergeo.utils import sauer_shelah, log_sauer_shelah
+
+
+def test_monitor_bound_is_same_as_hypinv_upperbound():
+    growth_function = sauer_shelah(3)
+    monitor = HypinvMonitor(growth_function, 0.05, k=2, m=40)
+    for error in [0, 1, 0, 0, 0, 1, 0, 0, 0, 0]*3:
+        bound = monitor.update(error)
+        assert bound == hypinv_upperbound(monitor.k, monitor.m, growth_function, 0.05, mprime=monitor.mprime)
+    assert (monitor.k, monitor.m) == (8, 70)
+
+    best_bound = optimize_mprime(monitor.k, monitor.m, growth_function, 0.05, max_mprime=15*monitor.m, return_bound=True)[1]
+    assert best_bound <= monitor.bound <= best_bound + 1e-3
+
+
+def test_monitor_add_and_reset():
+    growth_function = log_sauer_shelah(3)
+    monitor = HypinvMonitor(growth_function, np.log(0.05), log_delta=True)
+    assert monitor.bound == 1
+    monitor.add(3, 50)
+    assert monitor.bound == hypinv_upperbound(3, 50, growth_function, np.log(0.05), mprime=monitor.mprime, log_delta=True)
+    monitor.add(2, 20)
+    assert monitor.reset() == optimize_mprime(5, 70, growth_function, np.log(0.05), max_mprime=15*70, return_bound=True, log_delta=True)[1]
+    assert monitor.add(0, 0) == monitor.bound
+    assert HypinvMonitor(growth_function, np.log(0.05), k=10, m=10, log_delta=True).update(1) == 1
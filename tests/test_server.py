@@ -0,0 +1,60 @@
+import asyncio
+
+from hypergeo.server import *
+
+
+def test_evaluate_batch_is_same_as_scalar():
+    requests = [('hypergeometric_tail_inverse', {'k': k, 'm': 20, 'delta': 0.05, 'M': 50}) for k in range(5)]
+    requests += [('hypinv_upperbound', {'k': k, 'm': 20, 'd': 2, 'delta': 0.05, 'mprime': 40}) for k in range(5)]
+    requests += [('hypinv_upperbound', {'k': 1, 'm': 20, 'd': 2, 'delta': 0.05, 'mprime': 40, 'unknown': 1})]
+
+    results = evaluate_batch(requests)
+    for (name, kwargs), (result, error) in zip(requests[:-1], results[:-1]):
+        assert error is None
+        assert result == FUNCTIONS[name](**kwargs)
+    assert results[-1][0] is None
+    assert results[-1][1].startswith('TypeError')
+
+
+def test_server_answers_concurrent_requests_in_micro_batches():
+    async def run():
+        bound_server = BoundServer(batch_window=0.05)
+        server = await asyncio.start_server(bound_server.handle_connection, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+
+        clients = [BoundClient('127.0.0.1', port) for _ in range(10)]
+        results = await asyncio.gather(*(client.call('hypergeometric_tail_inverse', k=k, m=20, delta=0.05, M=50)
+                                         for k, client in enumerate(clients)))
+        try:
+            await clients[0].call('hypergeometric_tail_inverse', k=1, m=20, delta='a', M=50)
+            assert False
+        except ValueError:
+            pass
+        for client in clients:
+            await client.close()
+        server.close()
+        await server.wait_closed()
+        return results, bound_server.n_batches
+
+    results, n_batches = asyncio.run(run())
+    assert results == [hypergeometric_tail_inverse(k, 20, 0.05, 50) for k in range(10)]
+    assert n_batches == 2
+
+
+def test_server_answers_malformed_requests_with_400():
+    async def run():
+        server = await asyncio.start_server(BoundServer().handle_connection, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        responses = []
+        for request in [b'GARBAGE\r\n\r\n', b'POST /hypinv_upperbound HTTP/1.1\r\nContent-Length: abc\r\n\r\n']:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(request)
+            await writer.drain()
+            responses.append(await reader.read())
+            writer.close()
+        server.close()
+        await server.wait_closed()
+        return responses
+
+    for response in asyncio.run(run()):
+        assert response.startswith(b'HTTP/1.1 400 Bad Request')
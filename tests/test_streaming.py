@@ -0,0 +1,26 @@
+from hypergeo.streaming import *
+from hypergeo.hypergeometric_distribution import hypergeometric_tail_inverse
+from hypergeo.generalization_bounds import hypinv_upperbound
+from hypergeo.utils import sauer_shelah
+
+
+def test_stream_hypergeometric_tail_inverse_preserves_order():
+    params = [(k, 20, delta, 50) for k in range(21) for delta in [0.05, 0.001]]
+    Ks = stream_hypergeometric_tail_inverse(iter(params), batch_size=7)
+    assert list(Ks) == [hypergeometric_tail_inverse(*p) for p in params]
+
+
+def test_stream_hypergeometric_tail_inverse_is_lazy():
+    def params():
+        for k in range(10):
+            yield k, 10, 0.05, 30
+        raise RuntimeError('The stream was consumed beyond the first batch.')
+
+    Ks = stream_hypergeometric_tail_inverse(params(), batch_size=10)
+    assert len([next(Ks) for _ in range(10)]) == 10
+
+
+def test_stream_hypinv_upperbound():
+    params = [(k, 50, 0.05, mprime) for k in [0, 5, 50] for mprime in [50, 200]]
+    bounds = stream_hypinv_upperbound(params, sauer_shelah(5), batch_size=4)
+    assert list(bounds) == [hypinv_upperbound(k, m, sauer_shelah(5), delta, mprime) for k, m, delta, mprime in params]
@@ -0,0 +1,40 @@
+import numpy as np
+
+from hypergeo.sweep import *
+
+
+def test_compute_bound_curve():
+    k, m, d, delta = 2, 20, 2, 0.05
+    curve = compute_bound_curve(k, m, d, delta, max_mprime=30)
+    assert len(curve) == 30
+    assert curve[9] == hypinv_upperbound(k, m, sauer_shelah(d), delta, mprime=10)
+
+
+def test_mprime_tradeoff_sweep_reduces_curves():
+    ms, risks, ds, deltas = [10, 20], [0, .2], [2], [.05]
+    data = mprime_tradeoff_sweep(ms, risks, ds, deltas, max_mprime=30, n_workers=1)
+    curve = compute_bound_curve(4, 20, 2, .05, max_mprime=30)
+    point = data.sel(m=20, risk=.2, d=2, delta=.05)
+    assert point['mprime'] == np.argmin(curve) + 1
+    assert point['bound'] == np.min(curve)
+    assert point['bound_at_mprime=m'] == curve[19]
+
+
+def test_mprime_tradeoff_sweep_pool_is_same_as_serial(tmp_path):
+    ms, risks, ds, deltas = [10, 20], [0, .2], [2, 3], [.05]
+    serial = mprime_tradeoff_sweep(ms, risks, ds, deltas, max_mprime=30, n_workers=1)
+    parallel = mprime_tradeoff_sweep(ms, risks, ds, deltas, max_mprime=30, path=tmp_path, n_workers=2)
+    assert serial.equals(parallel)
+
+
+def test_mprime_tradeoff_sweep_resumes_from_store(tmp_path):
+    ms, risks, ds, deltas = [10, 20], [0, .2], [2], [.05]
+    first = mprime_tradeoff_sweep(ms, risks, ds, deltas, max_mprime=30, path=tmp_path, n_workers=1)
+    done = np.load(tmp_path / 'done.npy')
+    assert done.all()
+
+    # Invalidates one shard to force its recomputation
+    done[0] = False
+    np.save(tmp_path / 'done.npy', done)
+    resumed = mprime_tradeoff_sweep(ms, risks, ds, deltas, max_mprime=30, path=tmp_path, n_workers=1)
+    assert first.equals(resumed)
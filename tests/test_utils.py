@@ -0,0 +1,30 @@
+import numpy as np
+from math import comb, log
+
+from hypergeo.utils import *
+
+
+def test_exact_log_sauer_shelah_is_exact():
+    for d in [1, 3, 20]:
+        growth_function = exact_log_sauer_shelah(d)
+        assert growth_function is exact_log_sauer_shelah(d)
+        Ms = list(range(1, 300)) + [10**5, 10**6 + 7]
+        expected = [log(sum(comb(M, i) for i in range(min(d, M)+1))) for M in Ms]
+        values = [growth_function(M) for M in Ms]
+        assert np.allclose(values, expected, rtol=1e-14, atol=0)
+        # The values do not depend on the order of the calls.
+        assert [growth_function(M) for M in reversed(Ms)] == values[::-1]
+        assert np.allclose(growth_function(np.array(Ms)), values, rtol=1e-14, atol=0)
+        Ms = np.array(Ms[d-1:])
+        assert np.all(growth_function(Ms) <= log_sauer_shelah(d)(Ms) + 1e-12)
+
+
+def test_exact_sauer_shelah_is_exp_of_log():
+    assert np.isclose(exact_sauer_shelah(3)(100), sum(comb(100, i) for i in range(4)))
+
+
+def test_exact_log_sauer_shelah_accepts_floats():
+    growth_function = exact_log_sauer_shelah(10)
+    assert growth_function(1000.) == growth_function(1000)
+    assert growth_function(np.float64(10**6 + 7)) == growth_function(10**6 + 7)
+    assert growth_function(1000) < growth_function(1000.5) < growth_function(1001)